@@ -3,4 +3,10 @@ from django.apps import AppConfig
 
 class AdminAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'admin_app'
\ No newline at end of file
+    name = 'admin_app'
+
+    def ready(self):
+        # Register cache invalidation signal handlers
+        from . import signals  # noqa: F401
+        # Register the cache reachability system check
+        from . import checks  # noqa: F401
@@ -0,0 +1,113 @@
+"""
+Two-level cache backend: each process's memory in front of a shared cache.
+
+Reads try the local level first and fall back to the shared one (Redis),
+keeping what they find locally for ``LOCAL_TIMEOUT`` seconds. Writes and
+deletes go to both levels, so a process always sees its own changes; other
+processes may serve the previous value until their local copy expires.
+Version keys (see ``principals`` and ``search``) are therefore at most
+``LOCAL_TIMEOUT`` seconds behind in other workers.
+
+Configured with the aliases of the two levels::
+
+    'default': {
+        'BACKEND': 'admin_app.cache.TieredCache',
+        'OPTIONS': {'LOCAL': 'local', 'SHARED': 'redis', 'LOCAL_TIMEOUT': 5},
+    }
+"""
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    """Read-through local cache in front of a shared one"""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.local_alias = options['LOCAL']
+        self.shared_alias = options['SHARED']
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+
+    @property
+    def local(self):
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self.local.set(key, value, self.local_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.local.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            if shared:
+                self.local.set_many(shared, self.local_timeout, version=version)
+                found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(key, value, self._local_timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        # django-redis returns None rather than the list of failed keys
+        failed = list(self.shared.set_many(data, timeout, version=version) or [])
+        self.local.set_many(
+            {key: value for key, value in data.items() if key not in failed},
+            self._local_timeout(timeout), version=version,
+        )
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout), version=version)
+        else:
+            # Another process owns the key; read its value from the shared level
+            self.local.delete(key, version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.decr(key, delta, version=version)
+
+    def has_key(self, key, version=None):
+        return self.local.has_key(key, version=version) or self.shared.has_key(key, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self.local.delete_many(keys, version=version)
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
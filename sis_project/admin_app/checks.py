@@ -0,0 +1,34 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches)
+def check_caches_reachable(app_configs, **kwargs):
+    """Fail at startup when a configured cache cannot be written and read back"""
+    errors = []
+    for alias in settings.CACHES:
+        cache = caches[alias]
+        # Aliases can share a keyspace (the default tier is in front of
+        # Redis) and replicas start together, so each check uses its own
+        # key and value
+        token = uuid.uuid4().hex
+        key = f'checks:cache-reachable:{alias}:{token}'
+        try:
+            cache.set(key, token, 10)
+            reachable = cache.get(key) == token
+            cache.delete(key)
+        except Exception as exc:
+            reachable = False
+            detail = f'{type(exc).__name__}: {exc}'
+        else:
+            detail = 'a value written to it could not be read back'
+        if not reachable:
+            errors.append(Error(
+                f"Cache '{alias}' ({settings.CACHES[alias]['BACKEND']}) is not reachable: {detail}",
+                hint='Check that the cache server is running and that its host and password are set.',
+                id='admin_app.E001',
+            ))
+    return errors
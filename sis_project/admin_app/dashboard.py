@@ -0,0 +1,55 @@
+"""
+Admin dashboard statistics
+
+All dashboard numbers are fetched in one round trip (a UNION ALL of
+single-row aggregates) and kept as a cached snapshot. Writes to the
+underlying models drop the snapshot through ``invalidate_dashboard_stats``.
+"""
+from django.core.cache import cache
+from django.db.models import CharField, Count, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import School, AcademicGroup, Tutor
+
+
+DASHBOARD_STATS_CACHE_KEY = 'dashboard:stats'
+
+# Short TTL as a safety net; signal invalidation keeps the snapshot fresh
+DASHBOARD_STATS_CACHE_TIMEOUT = 60
+
+
+def _stat(queryset, name, aggregate):
+    """One ``(name, value)`` row; no GROUP BY, so empty tables still yield a row"""
+    return (
+        queryset.order_by()
+        .annotate(stat=Value(name, output_field=CharField()))
+        .values('stat')
+        .annotate(value=aggregate)
+        .values_list('stat', 'value')
+    )
+
+
+def compute_dashboard_stats():
+    """Compute all dashboard numbers with a single query"""
+    groups = AcademicGroup.objects.all()
+    first, *rest = [
+        _stat(groups, 'total_students', Coalesce(Sum('current_students'), 0)),
+        _stat(Tutor.objects.filter(is_active=True), 'total_tutors', Count('pk')),
+        _stat(groups, 'total_academic_groups', Count('pk')),
+        _stat(School.objects.all(), 'total_schools', Count('pk')),
+    ]
+    return dict(first.union(*rest, all=True))
+
+
+def get_dashboard_stats():
+    """Return the cached dashboard snapshot, computing it on a miss"""
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(DASHBOARD_STATS_CACHE_KEY, stats, DASHBOARD_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached snapshot so the next dashboard view recomputes it"""
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
@@ -0,0 +1,170 @@
+"""
+Slow-query log and duplicate-query (N+1) detector.
+
+``QueryInspector`` is installed per request with
+``connection.execute_wrapper``. It records statements slower than
+``SLOW_QUERY_MS`` and, at the end of the request, statements whose SQL ran
+more than ``DUPLICATE_QUERY_THRESHOLD`` times - the signature of a query
+issued once per row. Each finding names the view and the first frame of
+project code that issued the query. Findings are logged to
+``admin_app.diagnostics`` and the most recent ones are kept in the cache
+for the super admin diagnostics page.
+
+Each finding is stored under its own key, in a ring of ``MAX_FINDINGS``
+slots numbered by an atomic ``cache.incr``, so concurrent requests never
+overwrite each other's findings.
+"""
+import json
+import logging
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from operator import itemgetter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger('admin_app.diagnostics')
+
+FINDINGS_SEQUENCE_KEY = 'diagnostics:findings:sequence'
+MAX_FINDINGS = 200
+MAX_SQL_LENGTH = 2000
+
+_PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+def query_origin():
+    """``file:line in function`` of the innermost project frame issuing a query"""
+    for frame in reversed(traceback.extract_stack()):
+        filename = str(Path(frame.filename).resolve())
+        if (filename.startswith(_PROJECT_DIR) and filename != _THIS_FILE
+                and 'site-packages' not in filename):
+            return f'{Path(filename).relative_to(_PROJECT_DIR)}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class QueryInspector:
+    """Watch the queries of one request for slow and repeated statements"""
+
+    def __init__(self, slow_seconds, duplicate_threshold):
+        self.slow_seconds = slow_seconds
+        self.duplicate_threshold = duplicate_threshold
+        self.view_name = None
+        self.slow_queries = []
+        self.counts = Counter()
+        self.duplicate_origins = {}
+        self._exit_stack = ExitStack()
+
+    def __enter__(self):
+        for alias in connections:
+            self._exit_stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._exit_stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            # The SQL still has its placeholders, so per-row lookups that
+            # differ only in their parameters count as the same statement
+            self.counts[sql] += 1
+            if self.counts[sql] == self.duplicate_threshold + 1:
+                # Walking the stack is costly; only do it once per statement
+                self.duplicate_origins[sql] = query_origin()
+            if duration >= self.slow_seconds:
+                self.slow_queries.append((sql, duration, query_origin()))
+
+    def findings(self, request):
+        """Findings for this request, as JSON-serializable dicts"""
+        base = {
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'view': self.view_name,
+        }
+        findings = [
+            {**base, 'kind': 'slow', 'sql': sql[:MAX_SQL_LENGTH],
+             'duration_ms': round(duration * 1000, 1), 'origin': origin}
+            for sql, duration, origin in self.slow_queries
+        ]
+        findings.extend(
+            {**base, 'kind': 'duplicate', 'sql': sql[:MAX_SQL_LENGTH],
+             'count': count, 'origin': self.duplicate_origins.get(sql)}
+            for sql, count in self.counts.items()
+            if count > self.duplicate_threshold
+        )
+        return findings
+
+
+def _finding_key(sequence):
+    return f'diagnostics:finding:{sequence % MAX_FINDINGS}'
+
+
+def _reserve_sequences(count):
+    """Atomically take the next ``count`` sequence numbers; return the last"""
+    cache.add(FINDINGS_SEQUENCE_KEY, 0, None)
+    try:
+        return cache.incr(FINDINGS_SEQUENCE_KEY, count)
+    except ValueError:
+        # The counter was evicted or cleared between add() and incr()
+        cache.add(FINDINGS_SEQUENCE_KEY, 0, None)
+        return cache.incr(FINDINGS_SEQUENCE_KEY, count)
+
+
+def record_findings(findings):
+    """Log findings and keep the newest ``MAX_FINDINGS`` for the diagnostics page"""
+    if not findings:
+        return
+    for finding in findings:
+        logger.warning(json.dumps({'event': f"{finding['kind']}_query", **finding}))
+    last = _reserve_sequences(len(findings))
+    first = last - len(findings) + 1
+    cache.set_many({
+        _finding_key(sequence): {**finding, 'sequence': sequence}
+        for sequence, finding in enumerate(findings, start=first)
+    }, None)
+
+
+def get_findings():
+    """Recent findings, newest first"""
+    last = cache.get(FINDINGS_SEQUENCE_KEY)
+    if not last:
+        return []
+    oldest = max(last - MAX_FINDINGS + 1, 1)
+    stored = cache.get_many([_finding_key(sequence) for sequence in range(oldest, last + 1)])
+    # A slot may still hold an older finding when its new one is being
+    # written by a concurrent request
+    findings = [finding for finding in stored.values() if finding['sequence'] >= oldest]
+    return sorted(findings, key=itemgetter('sequence'), reverse=True)
+
+
+def clear_findings():
+    cache.delete_many([FINDINGS_SEQUENCE_KEY, *(_finding_key(slot) for slot in range(MAX_FINDINGS))])
+
+
+def summarize_findings(findings):
+    """Group findings by kind, view and origin, most frequent first"""
+    groups = {}
+    for finding in findings:
+        key = (finding['kind'], finding['view'], finding['origin'], finding['sql'])
+        group = groups.setdefault(key, {
+            'kind': finding['kind'],
+            'view': finding['view'],
+            'origin': finding['origin'],
+            'sql': finding['sql'],
+            'occurrences': 0,
+            'worst': 0,
+            'last_seen': finding['time'],
+        })
+        group['occurrences'] += 1
+        group['worst'] = max(group['worst'], finding.get('duration_ms') or finding.get('count') or 0)
+    return sorted(groups.values(), key=lambda group: group['occurrences'], reverse=True)
@@ -106,7 +106,7 @@ class AcademicGroupForm(forms.ModelForm):
     class Meta:
         model = AcademicGroup
         fields = ['school', 'department', 'group_name', 'study_year', 'semester', 
-                 'academic_year', 'max_students', 'current_students', 'description', 'is_active']
+                 'academic_year', 'max_students', 'description', 'is_active']
         widgets = {
             'school': forms.Select(attrs={
                 'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary/20 focus:border-primary transition-all',
@@ -136,11 +136,6 @@ class AcademicGroupForm(forms.ModelForm):
                 'max': '100',
                 'placeholder': 'Maximum number of students'
             }),
-            'current_students': forms.NumberInput(attrs={
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary/20 focus:border-primary transition-all',
-                'min': '0',
-                'placeholder': 'Current number of students'
-            }),
             'description': forms.Textarea(attrs={
                 'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary/20 focus:border-primary transition-all',
                 'rows': 3,
@@ -170,14 +165,26 @@ class AcademicGroupForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
-        current_students = cleaned_data.get('current_students', 0)
-        max_students = cleaned_data.get('max_students', 0)
+        max_students = cleaned_data.get('max_students')
         
-        if current_students > max_students:
-            raise forms.ValidationError('Current students cannot exceed maximum students.')
+        # current_students is counted from the group's students, not edited here
+        if max_students is not None and self.instance.current_students > max_students:
+            self.add_error('max_students', 'Maximum students cannot be less than the current number of students.')
         
         return cleaned_data
 
+    def save(self, commit=True):
+        academic_group = super().save(commit=False)
+        if commit:
+            if academic_group._state.adding:
+                academic_group.save()
+            else:
+                # Write back only the edited columns: the Student signals may
+                # have changed current_students since this form loaded it
+                academic_group.save(update_fields=[*self._meta.fields, 'group_code', 'updated_at'])
+            self._save_m2m()
+        return academic_group
+
 
 class TutorForm(forms.ModelForm):
     class Meta:
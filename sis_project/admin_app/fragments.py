@@ -0,0 +1,29 @@
+"""
+Cached template fragments
+
+The academic group tables (admin list and tutor list) are cached with
+``{% cache %}``, keyed by ``group_tables_version()`` together with the
+query string (and the tutor). Writes to groups, their schools and
+departments, student enrolment and tutor assignments bump the version, so
+every cached table goes stale at once. Views pass the page as a lazy object
+so that a cache hit skips the pagination queries too.
+"""
+import time
+
+from django.core.cache import cache
+
+GROUP_TABLES_VERSION_KEY = 'fragments:group-tables:version'
+
+
+def group_tables_version():
+    """Version stamp for cached group tables, bumped on writes they show"""
+    version = cache.get(GROUP_TABLES_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(GROUP_TABLES_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_group_tables():
+    """Make every cached group table stale"""
+    cache.set(GROUP_TABLES_VERSION_KEY, time.time_ns(), None)
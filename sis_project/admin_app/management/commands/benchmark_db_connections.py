@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from admin_app.models import Student
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values``"""
+    ordered = sorted(values)
+    return ordered[max(int(round(fraction * len(ordered))) - 1, 0)]
+
+
+class Command(BaseCommand):
+    """Measure what opening a database connection per request costs."""
+
+    help = (
+        "Simulates request cycles, each running one small query, with a new "
+        "connection per request (CONN_MAX_AGE=0) and with persistent "
+        "connections, and reports the latency of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Request cycles per mode (default: 500)')
+        parser.add_argument(
+            '--max-age', type=int, default=60,
+            help='CONN_MAX_AGE used for the persistent mode (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        original = settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS']
+        self.stdout.write(
+            f"{options['requests']} request cycles per mode against "
+            f"{connection.vendor} at {settings_dict['HOST'] or 'local'}:"
+        )
+        self.stdout.write(f"  {'mode':<34} {'p50':>8} {'p95':>8} {'p99':>8}")
+        try:
+            modes = (
+                ('new connection per request', 0, False),
+                (f"persistent (max age {options['max_age']}s)", options['max_age'], False),
+                ('persistent + health checks', options['max_age'], True),
+            )
+            for name, max_age, health_checks in modes:
+                settings_dict['CONN_MAX_AGE'] = max_age
+                settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+                timings = self.run(options['requests'])
+                self.stdout.write(
+                    f"  {name:<34} "
+                    + ' '.join(f"{percentile(timings, fraction) * 1000:8.2f}" for fraction in (0.5, 0.95, 0.99))
+                    + ' ms'
+                )
+        finally:
+            connection.close()
+            settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = original
+
+    def run(self, requests):
+        # Start every mode without a connection, and let one warm-up cycle
+        # open the persistent one
+        connection.close()
+        self.cycle()
+        return [self.cycle() for _ in range(requests)]
+
+    def cycle(self):
+        """One request's worth of connection handling around a primary key lookup"""
+        started = time.perf_counter()
+        # The handlers Django runs at the start and end of every request;
+        # they close the connection when CONN_MAX_AGE has expired
+        request_started.send(sender=self.__class__)
+        Student.objects.filter(pk=0).exists()
+        request_finished.send(sender=self.__class__)
+        return time.perf_counter() - started
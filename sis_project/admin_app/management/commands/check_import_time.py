@@ -0,0 +1,90 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Upper bound for ``python -X importtime manage.py check``, in milliseconds.
+# The project currently starts in about 260 ms; the headroom absorbs
+# machine-to-machine noise, not new heavy imports.
+IMPORT_TIME_BUDGET_MS = 400
+
+# Libraries only export and document code needs; importing any of them while
+# the project starts makes every worker pay for it on boot.
+LAZY_MODULES = ('pandas', 'numpy', 'openpyxl', 'docx')
+
+
+def parse_importtime(output):
+    """Return ``(module, self_us, cumulative_us, depth)`` for each ``-X importtime`` line"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        if not self_us.strip().isdigit():
+            # Column header
+            continue
+        module = name.strip()
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((module, int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+class Command(BaseCommand):
+    """Fail when the project's startup import time regresses."""
+
+    help = (
+        "Runs 'manage.py check' under 'python -X importtime' and fails if the "
+        "imports take longer than the budget or load an export-only library."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS,
+            help='Maximum total import time in milliseconds',
+        )
+        parser.add_argument(
+            '--runs', type=int, default=3,
+            help='Number of runs; the fastest one is compared to the budget',
+        )
+        parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+
+    def handle(self, *args, **options):
+        runs = [self.measure() for _ in range(max(options['runs'], 1))]
+        entries = min(runs, key=self.total_us)
+        total_ms = self.total_us(entries) / 1000
+
+        self.stdout.write(f"Slowest imports of {len(entries)} modules:")
+        for module, _, cumulative_us, _ in sorted(entries, key=lambda entry: entry[2], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+        failures = []
+        loaded = sorted({module for module, _, _, _ in entries if module.split('.')[0] in LAZY_MODULES})
+        if loaded:
+            roots = sorted({module.split('.')[0] for module in loaded})
+            failures.append(f"imported at startup: {', '.join(roots)}")
+        if total_ms > options['budget_ms']:
+            failures.append(f"import time {total_ms:.0f} ms over budget {options['budget_ms']:.0f} ms")
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(f"FAIL  {failure}"))
+            raise CommandError(f"{len(failures)} import time check(s) failed")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imports took {total_ms:.0f} ms (budget {options['budget_ms']:.0f} ms)"
+        ))
+
+    @staticmethod
+    def total_us(entries):
+        return sum(cumulative_us for _, _, cumulative_us, depth in entries if depth == 0)
+
+    def measure(self):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', 'manage.py', 'check'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"'manage.py check' failed:\n{result.stderr[-2000:]}")
+        return parse_importtime(result.stderr)
@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from admin_app.models import FAMILY_FLAG_INDEXES, Student, Tutor
+from admin_app.seeding import DatasetGenerator
+
+
+# Seed for the throwaway dataset; rolled back after the check
+PLAN_CHECK_SEED = 9000
+
+# (description, queryset builder taking a tutor's group ids, index the plan must use)
+PLAN_CHECKS = (
+    (
+        "active students of a tutor's groups",
+        lambda group_ids: Student.objects.filter(academic_group_id__in=group_ids, is_active=True).order_by(),
+        "students_active_group_idx",
+    ),
+) + tuple(
+    (
+        f"{flag} filter",
+        lambda group_ids, flag=flag: Student.objects.filter(
+            academic_group_id__in=group_ids, is_active=True, **{flag: True}
+        ).order_by(),
+        index_name,
+    )
+    for flag, index_name in FAMILY_FLAG_INDEXES
+)
+
+
+class Command(BaseCommand):
+    """Verify that the report predicates are served by their indexes."""
+
+    help = (
+        "Seeds a throwaway dataset, runs EXPLAIN on the report queries with the "
+        "default planner settings and fails if an expected index is not used. "
+        "The dataset is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--students', type=int, default=20000,
+            help='Students in the throwaway dataset (default: 20,000)',
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            group_ids = self.seed(options['students'])
+            # Give the planner row counts for the new data
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            for description, build_queryset, index_name in PLAN_CHECKS:
+                plan = build_queryset(group_ids).explain()
+                if index_name in plan:
+                    self.stdout.write(self.style.SUCCESS(f"OK    {description}: uses {index_name}"))
+                else:
+                    failures.append(description)
+                    self.stdout.write(self.style.ERROR(f"FAIL  {description}: {index_name} not used"))
+                if options["verbosity"] > 1:
+                    self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)} query plan check(s) failed")
+
+    def seed(self, students):
+        """Seed about ``students`` students; return the group ids of one tutor"""
+        generator = DatasetGenerator(seed=PLAN_CHECK_SEED)
+        if generator.already_seeded():
+            raise CommandError(f"Data for seed {PLAN_CHECK_SEED} already exists")
+        # The report's shape: 25 students per group, 4 groups per tutor
+        groups = max(students // 25, 4)
+        generator.generate(
+            schools=4, departments_per_school=5,
+            groups_per_department=max(groups // 20, 1), students_per_group=25,
+            tutors=1, groups_per_tutor=4, admins=0,
+        )
+        tutor = Tutor.objects.get(username=f'seed-tutor-{PLAN_CHECK_SEED}-0')
+        return list(tutor.assigned_groups.values_list('id', flat=True))
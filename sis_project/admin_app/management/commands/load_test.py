@@ -0,0 +1,317 @@
+import datetime
+import http.cookiejar
+import json
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from admin_app.models import Admin, Tutor, Student
+from admin_app.seeding import SEED_PASSWORD, seed_code_prefix
+from tutors_app.reports import FIELD_LABELS
+
+
+# Share of virtual users per role
+DEFAULT_MIX = 'admin=1,tutor=4,student=5'
+
+# The reports page with every field ticked, the heaviest page a tutor opens
+REPORT_PARAMS = {'apply_filter': '1', **{f'field_{field}': 'on' for field in FIELD_LABELS}}
+
+# (weight, url name, method, builder) per role. Builders take the virtual
+# user and return ``(url kwargs, query or form data)``.
+SCENARIOS = {
+    'admin': (
+        (4, 'dashboard', 'get', lambda user: ({}, {})),
+        (2, 'schools_list', 'get', lambda user: ({}, {})),
+        (3, 'academic_groups_list', 'get', lambda user: ({}, {})),
+        (2, 'tutors_list', 'get', lambda user: ({}, {})),
+    ),
+    'tutor': (
+        (4, 'tutors:dashboard', 'get', lambda user: ({}, {})),
+        (3, 'tutors:academic_groups', 'get', lambda user: ({}, {})),
+        (4, 'tutors:group_students', 'get', lambda user: ({'group_id': user.pick('groups')}, {})),
+        (2, 'tutors:reports', 'get', lambda user: ({}, REPORT_PARAMS)),
+        (3, 'tutors:view_student', 'get', lambda user: ({'student_id': user.pick('students')}, {})),
+        (3, 'tutors:student_autocomplete', 'get', lambda user: ({}, {'q': user.pick('prefixes')})),
+    ),
+    'student': (
+        (4, 'students:dashboard', 'get', lambda user: ({}, {})),
+        (2, 'students:general', 'get', lambda user: ({}, {})),
+        (2, 'students:personal_data', 'get', lambda user: ({}, {})),
+        (2, 'students:contact_info', 'get', lambda user: ({}, {})),
+        (1, 'students:contact_info', 'post', lambda user: ({}, user.contact_edit())),
+        (1, 'students:additional_info', 'get', lambda user: ({}, {})),
+    ),
+}
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Time redirects as the response they are, not the page they lead to"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class VirtualUser:
+    """One logged-in client replaying the weighted scenario of its role"""
+
+    def __init__(self, base_url, role, username, choices, seed):
+        self.base_url = base_url.rstrip('/')
+        self.role = role
+        self.username = username
+        self.choices = choices
+        self.rng = random.Random(seed)
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect)
+
+    def pick(self, name):
+        return self.rng.choice(self.choices[name])
+
+    def contact_edit(self):
+        return {
+            'phone_number': f'+998 90 {self.rng.randint(100, 999)} {self.rng.randint(10, 99)} {self.rng.randint(10, 99)}',
+            'home_address': f'Tashkent, {self.rng.randint(1, 120)}-house',
+            'email': f'{self.username.lower()}@example.com',
+            'telegram_username': f'@{self.username.lower()}',
+        }
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ''
+
+    def request(self, method, path, data=None):
+        """Send one request and return ``(status, seconds)``"""
+        url = self.base_url + path
+        body = None
+        headers = {}
+        if method == 'get' and data:
+            url += '?' + urllib.parse.urlencode(data)
+        elif method == 'post':
+            body = urllib.parse.urlencode({**(data or {}), 'csrfmiddlewaretoken': self.csrf_token()}).encode()
+            headers = {'Content-Type': 'application/x-www-form-urlencoded', 'Referer': url}
+
+        started = time.perf_counter()
+        try:
+            with self.opener.open(urllib.request.Request(url, body, headers, method=method.upper()), timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            status = error.code
+        except (urllib.error.URLError, OSError):
+            status = 0
+        return status, time.perf_counter() - started
+
+    def log_in(self):
+        status, _ = self.request('post', reverse('login_submit'), {'username': self.username, 'password': SEED_PASSWORD})
+        if status != 302:
+            raise CommandError(f'Could not log in as {self.username} (HTTP {status})')
+
+    def run(self, deadline, think_time, record):
+        scenario = SCENARIOS[self.role]
+        weights = [weight for weight, *_ in scenario]
+        while time.monotonic() < deadline:
+            _, name, method, build = self.rng.choices(scenario, weights=weights)[0]
+            kwargs, data = build(self)
+            status, seconds = self.request(method, reverse(name, kwargs=kwargs), data)
+            record(f'{method.upper()} {name}', status, seconds)
+            if think_time:
+                time.sleep(self.rng.uniform(0, 2 * think_time))
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, duration):
+    latencies = sorted(latencies)
+    milliseconds = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / duration, 2) if duration else None,
+        'mean_ms': milliseconds(sum(latencies) / len(latencies)) if latencies else None,
+        'p50_ms': milliseconds(percentile(latencies, 50)),
+        'p95_ms': milliseconds(percentile(latencies, 95)),
+        'p99_ms': milliseconds(percentile(latencies, 99)),
+        'max_ms': milliseconds(latencies[-1]) if latencies else None,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """Replay role-based traffic against a running server and report latency percentiles."""
+
+    help = (
+        "Logs in seeded admins, tutors and students (see seed_sis) against a running "
+        "server, replays a weighted mix of their pages for --duration seconds and "
+        "reports p50/p95/p99 latency and throughput per URL name as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load (default: %(default)s)')
+        parser.add_argument('--seed', type=int, default=0, help='seed_sis seed whose accounts are used (default: 0)')
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users (default: 20)')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Relative share of users per role (default: %(default)s)')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds of load after login (default: 60)')
+        parser.add_argument('--think-time', type=float, default=0, help='Mean pause between requests per user, in seconds')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Earlier JSON report to print p95 changes against')
+
+    def handle(self, *args, **options):
+        mix = self.parse_mix(options['mix'])
+        users = self.build_users(options, mix)
+
+        self.stdout.write(f"Logging in {len(users)} users against {options['base_url']}...")
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            list(pool.map(VirtualUser.log_in, users))
+
+        samples = {}
+        lock = threading.Lock()
+
+        def record(name, status, seconds):
+            with lock:
+                latencies, errors = samples.setdefault(name, ([], [0]))
+                latencies.append(seconds)
+                if not 200 <= status < 400:
+                    errors[0] += 1
+
+        self.stdout.write(f"Running for {options['duration']:g}s...")
+        started_at = datetime.datetime.now(datetime.timezone.utc)
+        started = time.monotonic()
+        deadline = started + options['duration']
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            for future in [pool.submit(user.run, deadline, options['think_time'], record) for user in users]:
+                future.result()
+        duration = time.monotonic() - started
+
+        report = {
+            'meta': {
+                'commit': current_commit(),
+                'started_at': started_at.isoformat(),
+                'base_url': options['base_url'],
+                'duration_s': round(duration, 2),
+                'users': {role: sum(user.role == role for user in users) for role in mix},
+                'think_time_s': options['think_time'],
+                'seed': options['seed'],
+            },
+            'total': summarize(
+                [latency for latencies, _ in samples.values() for latency in latencies],
+                sum(errors[0] for _, errors in samples.values()),
+                duration,
+            ),
+            'endpoints': {
+                name: summarize(latencies, errors[0], duration)
+                for name, (latencies, errors) in sorted(samples.items())
+            },
+        }
+        self.print_report(report)
+        if options['compare']:
+            self.print_comparison(report, options['compare'])
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+    def parse_mix(self, value):
+        mix = {}
+        for part in value.split(','):
+            role, _, share = part.partition('=')
+            role = role.strip()
+            if role not in SCENARIOS:
+                raise CommandError(f"Unknown role {role!r} in --mix; expected {', '.join(SCENARIOS)}")
+            try:
+                mix[role] = float(share)
+            except ValueError:
+                raise CommandError(f'Invalid share {share!r} for {role} in --mix')
+        if sum(mix.values()) <= 0:
+            raise CommandError('--mix must give at least one role a positive share')
+        return mix
+
+    def build_users(self, options, mix):
+        """Spread --users over the roles and pair each with a seeded account"""
+        seed = options['seed']
+        prefix = seed_code_prefix(seed)
+        total_share = sum(mix.values())
+        counts = {role: round(options['users'] * share / total_share) for role, share in mix.items()}
+
+        accounts = {
+            'admin': list(Admin.objects.filter(username__startswith=f'seed-admin-{seed}-')
+                          .order_by('id').values_list('username', flat=True)[:counts.get('admin', 0)]),
+            'tutor': list(Tutor.objects.filter(username__startswith=f'seed-tutor-{seed}-', is_active=True)
+                          .order_by('id')[:counts.get('tutor', 0)]),
+            'student': list(Student.objects.filter(student_id__startswith=f'ST{prefix}', is_active=True)
+                            .order_by('id').values_list('username', flat=True)[:counts.get('student', 0)]),
+        }
+        for role, count in counts.items():
+            if count and not accounts[role]:
+                raise CommandError(f'No seeded {role} accounts for seed {seed}; run seed_sis --seed {seed} first')
+
+        users = []
+        for role, count in counts.items():
+            for number in range(count):
+                # More users than accounts share logins round-robin
+                account = accounts[role][number % len(accounts[role])]
+                choices = self.tutor_choices(account) if role == 'tutor' else {}
+                username = account.username if role == 'tutor' else account
+                users.append(VirtualUser(options['base_url'], role, username, choices, seed=f'{seed}-{role}-{number}'))
+        if not users:
+            raise CommandError('--users and --mix leave no virtual users')
+        return users
+
+    def tutor_choices(self, tutor):
+        """Groups, students and search prefixes a tutor's requests pick from"""
+        groups = list(tutor.assigned_groups.filter(is_active=True).values_list('id', flat=True))
+        students = list(
+            Student.objects.filter(academic_group_id__in=groups, is_active=True)
+            .order_by('id').values_list('id', 'last_name')[:200]
+        )
+        if not groups or not students:
+            raise CommandError(f'Tutor {tutor.username} has no groups with students')
+        return {
+            'groups': groups,
+            'students': [student_id for student_id, _ in students],
+            'prefixes': sorted({last_name[:length] for _, last_name in students for length in (2, 3)}),
+        }
+
+    def print_report(self, report):
+        self.stdout.write(f"{'endpoint':<40} {'reqs':>6} {'err':>4} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+        rows = list(report['endpoints'].items()) + [('TOTAL', report['total'])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<40} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>7} "
+                f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+            )
+
+    def print_comparison(self, report, path):
+        with open(path) as previous_file:
+            previous = json.load(previous_file)
+        self.stdout.write(f"p95 change against {path} (commit {previous['meta'].get('commit')}):")
+        for name, stats in report['endpoints'].items():
+            before = previous['endpoints'].get(name, {}).get('p95_ms')
+            if before and stats['p95_ms'] is not None:
+                change = (stats['p95_ms'] - before) / before * 100
+                self.stdout.write(f"  {name:<40} {before:>8} -> {stats['p95_ms']:>8} ms ({change:+.0f}%)")
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from admin_app.dashboard import invalidate_dashboard_stats
+from admin_app.fragments import invalidate_group_tables
+from admin_app.models import AcademicGroup, Student
+
+
+class Command(BaseCommand):
+    """Fix drift in the denormalized AcademicGroup.current_students counters."""
+
+    help = "Recomputes AcademicGroup.current_students from active students with one grouped aggregate."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted groups without writing any changes.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Lock the groups before counting: a student saved meanwhile then
+            # waits to apply its counter change on top of the reconciled value
+            groups = list(
+                AcademicGroup.objects.select_for_update().only("id", "group_name", "current_students")
+            )
+
+            # One grouped aggregate for the true counts of every group
+            actual_counts = dict(
+                Student.objects.filter(is_active=True)
+                .order_by()
+                .values_list("academic_group")
+                .annotate(total=Count("id"))
+            )
+
+            drifted = []
+            for group in groups:
+                actual = actual_counts.get(group.id, 0)
+                if group.current_students != actual:
+                    self.stdout.write(
+                        f"{group.group_name} (id={group.id}): {group.current_students} -> {actual}"
+                    )
+                    group.current_students = actual
+                    drifted.append(group)
+
+            if drifted and not options["dry_run"]:
+                AcademicGroup.objects.bulk_update(drifted, ["current_students"], batch_size=500)
+                transaction.on_commit(invalidate_dashboard_stats)
+                transaction.on_commit(invalidate_group_tables)
+
+        if not drifted:
+            self.stdout.write("All group counters are up to date.")
+        elif options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"{len(drifted)} group counter(s) drifted (dry run, nothing written)")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Reconciled {len(drifted)} group counter(s)")
+            )
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_app.dashboard import invalidate_dashboard_stats
+from admin_app.fragments import invalidate_group_tables
+from admin_app.search import invalidate_student_search
+from admin_app.seeding import DatasetGenerator, DEFAULT_BATCH_SIZE, SEED_PASSWORD
+
+
+# Dataset at --scale 1: 4 schools x 5 departments x 2 groups x 25 students,
+# i.e. 1,000 students. Schools and departments stay fixed as the scale grows;
+# groups and tutors grow with it, so --scale 100 gives 100,000 students in
+# 4,000 groups looked after by 1,000 tutors.
+BASE_SCALE = {
+    'schools': 4,
+    'departments_per_school': 5,
+    'groups_per_department': 2,
+    'students_per_group': 25,
+    'tutors': 10,
+    'groups_per_tutor': 4,
+}
+SCALED_FACTORS = ('groups_per_department', 'tutors')
+
+
+class Command(BaseCommand):
+    """Generate a deterministic synthetic dataset for load testing."""
+
+    help = (
+        "Seeds schools, departments, academic groups, tutors and students (with "
+        "hobbies, skills and languages) using bulk inserts. The same --seed and "
+        "scale always produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument(
+            '--scale', type=float, default=1.0,
+            help='Multiplier for groups and tutors; 1 is about 1,000 students, 100 about 100,000',
+        )
+        for factor in BASE_SCALE:
+            parser.add_argument(
+                f"--{factor.replace('_', '-')}", type=int, dest=factor,
+                help=f'Override the scaled {factor.replace("_", " ")} count',
+            )
+        parser.add_argument('--admins', type=int, default=1, help='Number of admins (the first is a super admin)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('--scale must be positive')
+
+        scale = {
+            factor: max(1, round(value * options['scale'])) if factor in SCALED_FACTORS else value
+            for factor, value in BASE_SCALE.items()
+        }
+        for factor in BASE_SCALE:
+            if options[factor] is not None:
+                scale[factor] = options[factor]
+
+        generator = DatasetGenerator(seed=options['seed'], batch_size=options['batch_size'], stdout=self.stdout)
+        if generator.already_seeded():
+            raise CommandError(f"Data for seed {options['seed']} already exists; pick another --seed")
+
+        self.stdout.write(
+            f"Seeding {scale['schools'] * scale['departments_per_school'] * scale['groups_per_department'] * scale['students_per_group']:,} "
+            f"students (seed {options['seed']})..."
+        )
+        started = time.perf_counter()
+        counts = generator.generate(admins=options['admins'], **scale)
+        elapsed = time.perf_counter() - started
+
+        # bulk_create skips the signals that normally drop these caches
+        invalidate_dashboard_stats()
+        invalidate_student_search()
+        invalidate_group_tables()
+
+        summary = ', '.join(f"{count:,} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {elapsed:.1f}s"))
+        self.stdout.write(
+            f"Log in as seed-admin-{options['seed']}-0, seed-tutor-{options['seed']}-0 or any student "
+            f"ID card, all with password '{SEED_PASSWORD}'"
+        )
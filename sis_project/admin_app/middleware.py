@@ -0,0 +1,127 @@
+"""
+Request middleware for the session-based SIS portals
+"""
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.functional import SimpleLazyObject
+
+from .diagnostics import QueryInspector, record_findings
+from .principals import load_principal
+from .profiling import RequestProfile, Sampler, log_profile, logger
+
+
+class PrincipalMiddleware:
+    """
+    Attach the logged-in Admin, Tutor or Student as ``request.principal``.
+
+    The principal is resolved from the session's ``user_type`` on first
+    access only, so pages that never touch it pay nothing. Logging in
+    clears the other roles' keys, so ``user_type`` always names the one
+    ``<role>_id`` the views check. Loading goes
+    through the principal cache, so repeat requests skip the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.principal = SimpleLazyObject(lambda: self.get_principal(request))
+        return self.get_response(request)
+
+    @staticmethod
+    def get_principal(request):
+        role = request.session.get('user_type')
+        if not role:
+            return None
+        return load_principal(role, request.session.get(f'{role}_id'))
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in timing of database, template and Python time per request.
+
+    Enabled with ``REQUEST_PROFILING``; otherwise Django drops it from the
+    stack at startup. Each response gets a ``Server-Timing`` header (shown
+    in the browser's network panel) and a JSON line is logged to the
+    ``admin_app.profiling`` logger. A ``REQUEST_PROFILING_SAMPLE_RATE``
+    share of requests also runs under a code profiler, whose output is kept
+    in ``REQUEST_PROFILING_DIR`` when the request took longer than
+    ``REQUEST_PROFILING_SLOW_MS``. Template time is only measured with the
+    ``admin_app.profiling.ProfilingDjangoTemplates`` backend, which the
+    settings select together with ``REQUEST_PROFILING``.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 0.0)
+        self.slow_seconds = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 500) / 1000
+        self.profiler = getattr(settings, 'REQUEST_PROFILING_PROFILER', 'cprofile')
+        self.output_dir = getattr(settings, 'REQUEST_PROFILING_DIR', settings.BASE_DIR / 'profiles')
+
+    def __call__(self, request):
+        sampler = None
+        if self.sample_rate and random.random() < self.sample_rate:
+            sampler = Sampler(self.profiler, self.output_dir)
+            sampler.start()
+
+        with RequestProfile() as profile:
+            try:
+                response = self.get_response(request)
+            finally:
+                if sampler:
+                    sampler.stop()
+
+        response['Server-Timing'] = profile.server_timing()
+        log_profile(request, response, profile)
+        if sampler and profile.total >= self.slow_seconds:
+            path = sampler.dump(request, profile)
+            if path:
+                logger.warning('Slow request %s %s (%.0f ms) profiled to %s',
+                               request.method, request.path, profile.total * 1000, path)
+        return response
+
+
+class QueryDiagnosticsMiddleware:
+    """
+    Opt-in slow-query log and duplicate-query detector.
+
+    Enabled with ``QUERY_DIAGNOSTICS``. Queries slower than
+    ``SLOW_QUERY_MS`` and statements run more than
+    ``DUPLICATE_QUERY_THRESHOLD`` times in one request are logged and listed
+    on the super admin diagnostics page.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_DIAGNOSTICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'SLOW_QUERY_MS', 100) / 1000
+        self.duplicate_threshold = getattr(settings, 'DUPLICATE_QUERY_THRESHOLD', 5)
+
+    def __call__(self, request):
+        inspector = QueryInspector(self.slow_seconds, self.duplicate_threshold)
+        request.query_inspector = inspector
+        with inspector:
+            response = self.get_response(request)
+        if response.streaming:
+            # Streamed exports run their queries while the body is sent
+            response.streaming_content = self.inspect_stream(response.streaming_content, inspector, request)
+        else:
+            record_findings(inspector.findings(request))
+        return response
+
+    @staticmethod
+    def inspect_stream(content, inspector, request):
+        """Keep inspecting while the body streams; record when it ends"""
+        try:
+            with inspector:
+                yield from content
+        finally:
+            record_findings(inspector.findings(request))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_inspector.view_name = request.resolver_match.view_name
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_app', '0014_student_agreed_to_code_of_conduct_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['academic_group'], name='students_active_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_from_large_family', 'is_from_low_income_family', 'is_from_troubled_family', 'are_parents_deceased', 'are_parents_divorced', 'is_father_deceased', 'is_mother_deceased', 'has_disability'], name='students_family_flags_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+# Trigram GIN indexes on the expressions Django compiles ``icontains`` to on
+# PostgreSQL (``UPPER(col::text) LIKE UPPER(%term%)``). They are created
+# only on PostgreSQL, so they are not declared on the model.
+TRIGRAM_INDEXES = {
+    'students_first_name_trgm': 'first_name',
+    'students_last_name_trgm': 'last_name',
+    'students_middle_name_trgm': 'middle_name',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON students '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_app', '0015_student_report_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
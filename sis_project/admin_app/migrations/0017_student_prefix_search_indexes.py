@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+# Prefix indexes for the tutor autocomplete. ``istartswith`` compiles to
+# ``UPPER(col::text) LIKE UPPER('term%')`` on PostgreSQL, which a btree with
+# ``text_pattern_ops`` on the same expression serves as a range scan. Like
+# the trigram indexes they are PostgreSQL-only and not declared on the model.
+PREFIX_INDEXES = {
+    'students_last_name_prefix': 'last_name',
+    'students_first_name_prefix': 'first_name',
+    'students_student_id_prefix': 'student_id',
+    'students_id_card_prefix': 'id_card',
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON students '
+            f'(UPPER({column}::text) text_pattern_ops) WHERE is_active'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_app', '0016_student_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
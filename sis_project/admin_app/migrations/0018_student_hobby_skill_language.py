@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_app', '0017_student_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentHobby',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hobby', models.CharField(help_text='Hobby or interest', max_length=200)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hobby_entries', to='admin_app.student')),
+            ],
+            options={
+                'verbose_name_plural': 'Student Hobbies',
+                'db_table': 'student_hobbies',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentLanguage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(help_text='Language name', max_length=100)),
+                ('proficiency', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced'), ('native', 'Native')], default='intermediate', help_text='Proficiency level', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='language_entries', to='admin_app.student')),
+            ],
+            options={
+                'verbose_name_plural': 'Student Languages',
+                'db_table': 'student_languages',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(help_text='Special skill or talent', max_length=200)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_entries', to='admin_app.student')),
+            ],
+            options={
+                'verbose_name_plural': 'Student Skills',
+                'db_table': 'student_skills',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
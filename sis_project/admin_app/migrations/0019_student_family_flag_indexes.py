@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_app', '0018_student_hobby_skill_language'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='student',
+            name='students_family_flags_idx',
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_from_troubled_family', True)), fields=['academic_group'], name='students_troubled_family_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('are_parents_deceased', True), ('is_active', True)), fields=['academic_group'], name='students_parents_deceased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('are_parents_divorced', True), ('is_active', True)), fields=['academic_group'], name='students_parents_divorced_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_father_deceased', True)), fields=['academic_group'], name='students_father_deceased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_mother_deceased', True)), fields=['academic_group'], name='students_mother_deceased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('has_disability', True), ('is_active', True)), fields=['academic_group'], name='students_disability_idx'),
+        ),
+    ]
@@ -48,6 +48,9 @@ class School(models.Model):
         return f"{self.name} ({self.code})"
 
     def get_departments_count(self):
+        # schools_list_view annotates the count; fall back to a query otherwise
+        if hasattr(self, 'departments_count'):
+            return self.departments_count
         return self.departments.count()
 
 
@@ -159,13 +162,23 @@ class Tutor(models.Model):
         """Return the tutor's full name"""
         return f"{self.first_name} {self.last_name}"
 
+    def _prefetched_groups(self):
+        # Assigned groups loaded by prefetch_related('assigned_groups'), if any
+        return getattr(self, '_prefetched_objects_cache', {}).get('assigned_groups')
+
     def get_assigned_groups_count(self):
         """Return number of assigned groups"""
+        groups = self._prefetched_groups()
+        if groups is not None:
+            return len(groups)
         return self.assigned_groups.count()
 
     def get_total_students(self):
         """Return total number of students across all assigned groups"""
-        return sum(group.current_students for group in self.assigned_groups.filter(is_active=True))
+        groups = self._prefetched_groups()
+        if groups is None:
+            groups = self.assigned_groups.filter(is_active=True)
+        return sum(group.current_students for group in groups if group.is_active)
 
     def update_last_login(self):
         """Update the last login timestamp"""
@@ -173,6 +186,20 @@ class Tutor(models.Model):
         self.save(update_fields=['last_login'])
 
 
+# Family-status flags with a partial index each, keyed by group like the
+# tutor reports that filter on them. Only flags a few percent of students
+# have: large and low-income families are too common for an index to beat
+# the plain group index.
+FAMILY_FLAG_INDEXES = (
+    ('is_from_troubled_family', 'students_troubled_family_idx'),
+    ('are_parents_deceased', 'students_parents_deceased_idx'),
+    ('are_parents_divorced', 'students_parents_divorced_idx'),
+    ('is_father_deceased', 'students_father_deceased_idx'),
+    ('is_mother_deceased', 'students_mother_deceased_idx'),
+    ('has_disability', 'students_disability_idx'),
+)
+
+
 class Student(models.Model):
     MARITAL_STATUS_CHOICES = [
         ('single', 'Single'),
@@ -275,6 +302,23 @@ class Student(models.Model):
     class Meta:
         db_table = 'students'
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # Reports and group pages only ever list active students of a group
+            models.Index(
+                fields=['academic_group'],
+                condition=models.Q(is_active=True),
+                name='students_active_group_idx',
+            ),
+            # Family-status filters on the tutor reports page
+            *[
+                models.Index(
+                    fields=['academic_group'],
+                    condition=models.Q(is_active=True, **{flag: True}),
+                    name=name,
+                )
+                for flag, name in FAMILY_FLAG_INDEXES
+            ],
+        ]
 
     def __str__(self):
         full_name = f"{self.last_name} {self.first_name}"
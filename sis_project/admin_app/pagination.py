@@ -0,0 +1,284 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of ``OFFSET n`` the next page is fetched with a ``WHERE`` clause that
+starts right after the last row of the current page, so every page costs the
+same regardless of how deep the user has scrolled. The position is carried in
+an opaque, URL-safe cursor token.
+
+Totals are optional. Unfiltered PostgreSQL tables can report the planner's
+``pg_class.reltuples`` estimate instead of running ``COUNT(*)``.
+"""
+import base64
+import datetime
+import json
+from decimal import Decimal
+from operator import attrgetter
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+
+
+# Query parameters that carry a page position
+CURSOR_PARAMS = ('after', 'before', 'page')
+
+# Below this many (estimated) rows an exact COUNT(*) is cheap enough
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+
+def _encode_value(value):
+    # Dates are kept at full precision so equality on the cursor row holds
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+def encode_cursor(values, offset):
+    """Serialize the key values of a boundary row and its position"""
+    payload = json.dumps({'v': list(values), 'o': offset}, default=_encode_value, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return ``(values, offset)`` for a cursor token, or ``None`` if it is invalid"""
+    if not token:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        values, offset = payload['v'], int(payload['o'])
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(values, list):
+        return None
+    return values, max(offset, 0)
+
+
+def parse_ordering(ordering):
+    """Turn ``['name', '-id']`` style ordering into ``[(lookup, descending)]``"""
+    return [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+
+
+def order_by_keys(keys):
+    """``order_by()`` expressions for ``keys``; NULLs sort as the smallest value"""
+    return [
+        F(lookup).desc(nulls_last=True) if descending else F(lookup).asc(nulls_first=True)
+        for lookup, descending in keys
+    ]
+
+
+def _after(lookup, descending, value):
+    """Rows strictly after ``value`` in the column's sort direction"""
+    if descending:
+        if value is None:
+            return None
+        return Q(**{f'{lookup}__lt': value}) | Q(**{f'{lookup}__isnull': True})
+    if value is None:
+        return Q(**{f'{lookup}__isnull': False})
+    return Q(**{f'{lookup}__gt': value})
+
+
+def _equal(lookup, value):
+    if value is None:
+        return Q(**{f'{lookup}__isnull': True})
+    return Q(**{lookup: value})
+
+
+def keyset_filter(keys, values):
+    """
+    Build the ``WHERE`` clause selecting rows after ``values`` in ``keys`` order.
+
+    Expands the row comparison ``(k1, k2, ...) > (v1, v2, ...)`` into
+    ``k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...`` so mixed directions and
+    NULLs are handled the same way on PostgreSQL and SQLite.
+    """
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for (lookup, descending), value in zip(keys, values):
+        after = _after(lookup, descending, value)
+        if after is not None:
+            condition |= prefix & after
+        prefix &= _equal(lookup, value)
+    return condition
+
+
+def build_query(params, **updates):
+    """
+    Re-encode ``params`` (a ``QueryDict``) with ``updates`` applied.
+
+    Any existing page position is dropped, and a ``None`` value removes the
+    parameter, so links keep their filters but start from a fresh cursor.
+    """
+    query = params.copy()
+    for name in CURSOR_PARAMS:
+        query.pop(name, None)
+    for name, value in updates.items():
+        query.pop(name, None)
+        if value is not None:
+            query[name] = value
+    return query.urlencode()
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Planner estimate of the rows in ``model``'s table, or ``None``.
+
+    Reads ``pg_class.reltuples`` (kept fresh by autovacuum/ANALYZE), so it
+    costs a catalog lookup instead of a full table scan. Only available on
+    PostgreSQL, and only once the table has been analyzed.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class KeysetPage:
+    """One page of results plus the cursors of its neighbours"""
+
+    def __init__(self, object_list, offset, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.offset = offset
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = None
+        self.total_is_approximate = False
+        self.first_query = self.next_query = self.previous_query = ''
+
+    def set_link_queries(self, params):
+        """Prepare the query strings for the first, next and previous links"""
+        self.first_query = build_query(params)
+        if self.has_next():
+            self.next_query = build_query(params, after=self.next_cursor)
+        if self.has_previous():
+            self.previous_query = build_query(params, before=self.previous_cursor)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def start_index(self):
+        return self.offset + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.offset + len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by the given ordering, which must end in a unique key.
+
+    ``key`` extracts the ordering values from a fetched row; by default the
+    ordering lookups are read as attributes of model instances. Pass one when
+    the queryset yields ``values_list()`` tuples.
+
+    ``total`` decides what ``page.total`` holds: ``None`` (no total),
+    ``'exact'`` (``COUNT(*)``), ``'approximate'`` (the ``reltuples``
+    estimate for large unfiltered tables, exact otherwise) or a number the
+    caller already knows. A single page is always counted for free.
+    """
+
+    def __init__(self, queryset, ordering, per_page, key=None, total=None):
+        self.queryset = queryset
+        self.keys = parse_ordering(ordering)
+        self.per_page = per_page
+        self.key = key or self._attribute_key()
+        self.total = total
+
+    def count(self):
+        """Return ``(total, is_approximate)`` according to the ``total`` mode"""
+        if self.total == 'approximate' and not self.queryset.query.where:
+            estimate = estimated_row_count(self.queryset.model, self.queryset.db)
+            if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+                return estimate, True
+        if self.total in ('exact', 'approximate'):
+            return self.queryset.count(), False
+        return self.total, False
+
+    def _attribute_key(self):
+        getters = [attrgetter(lookup.replace('__', '.')) for lookup, _ in self.keys]
+        return lambda row: [getter(row) for getter in getters]
+
+    def _decode(self, token):
+        """Decode a cursor, rejecting ones that do not fit this ordering"""
+        position = decode_cursor(token)
+        if position is None or len(position[0]) != len(self.keys):
+            return None
+        try:
+            self.queryset.filter(keyset_filter(self.keys, position[0]))
+        except (ValueError, TypeError, ValidationError):
+            return None
+        return position
+
+    def get_page(self, after=None, before=None):
+        """
+        Return the page following the ``after`` cursor, or preceding ``before``.
+
+        Without a (valid) cursor the first page is returned.
+        """
+        before_position = self._decode(before) if not after else None
+        after_position = self._decode(after)
+
+        if before_position is not None:
+            values, offset = before_position
+            reversed_keys = [(lookup, not descending) for lookup, descending in self.keys]
+            rows = list(
+                self.queryset
+                .filter(keyset_filter(reversed_keys, values))
+                .order_by(*order_by_keys(reversed_keys))[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            offset = max(offset - len(rows), 0)
+            has_next = True
+        else:
+            queryset = self.queryset
+            offset = 0
+            if after_position is not None:
+                values, offset = after_position
+                queryset = queryset.filter(keyset_filter(self.keys, values))
+            rows = list(queryset.order_by(*order_by_keys(self.keys))[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = after_position is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(self.key(rows[-1]), offset + len(rows))
+        if rows and has_previous:
+            previous_cursor = encode_cursor(self.key(rows[0]), offset)
+        page = KeysetPage(rows, offset, next_cursor, previous_cursor)
+
+        if self.total is not None:
+            if not page.has_other_pages():
+                page.total = len(rows)
+            else:
+                page.total, page.total_is_approximate = self.count()
+        return page
+
+    def paginate(self, params):
+        """Return the page addressed by ``params`` with its link queries set"""
+        page = self.get_page(after=params.get('after'), before=params.get('before'))
+        page.set_link_queries(params)
+        return page
@@ -0,0 +1,217 @@
+"""
+Unified principal lookup for the shared login form and session users.
+
+Admins, tutors and students live in separate tables but share one login
+page. Instead of probing each table in turn, the candidates for a username
+are fetched with a single UNION query over the three indexed ``username``
+columns and then checked in priority order (admin, tutor, student).
+
+Once logged in, the session's principal is loaded through the cache by
+``load_principal``. Cache entries are keyed by a per-principal version that
+``invalidate_principal`` bumps whenever the profile is written.
+"""
+import functools
+import time
+
+from django.core.cache import cache
+from django.db.models import BooleanField, CharField, F, Value
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from .models import Admin, Tutor, Student
+
+
+# Checked in this order, mirroring the original admin -> tutor -> student flow
+ROLE_PRIORITY = ('admin', 'tutor', 'student')
+
+ROLE_MODELS = {
+    'admin': Admin,
+    'tutor': Tutor,
+    'student': Student,
+}
+
+# Related rows rendered alongside each principal, cached together with it
+ROLE_SELECT_RELATED = {
+    'admin': (),
+    'tutor': (),
+    'student': ('academic_group__school', 'academic_group__department'),
+}
+
+# Principals stay cached for a day unless their version is bumped earlier
+PRINCIPAL_CACHE_TIMEOUT = 60 * 60 * 24
+
+PRINCIPAL_FIELDS = ('role', 'id', 'username', 'password', 'first_name', 'last_name', 'super_admin')
+
+
+def _candidates_queryset(username):
+    """Build one UNION ALL query returning every active account named ``username``"""
+    querysets = []
+    for role in ROLE_PRIORITY:
+        model = ROLE_MODELS[role]
+        if role == 'admin':
+            super_admin = F('is_super_admin')
+        else:
+            super_admin = Value(False, output_field=BooleanField())
+        querysets.append(
+            model.objects.filter(username=username, is_active=True)
+            .order_by()
+            .annotate(
+                role=Value(role, output_field=CharField()),
+                super_admin=super_admin,
+            )
+            .values_list(*PRINCIPAL_FIELDS)
+        )
+    first, *rest = querysets
+    return first.union(*rest, all=True)
+
+
+def find_principal_candidates(username):
+    """Return ``{role: row_dict}`` for all active accounts with this username"""
+    return {
+        row[0]: dict(zip(PRINCIPAL_FIELDS, row))
+        for row in _candidates_queryset(username)
+    }
+
+
+def _password_matches(role, stored_password, raw_password):
+    """Compare a submitted password against the stored value for ``role``"""
+    if role == 'student':
+        # Students use Django hashes
+        if not stored_password:
+            return False
+        from django.contrib.auth.hashers import check_password
+        return check_password(raw_password, stored_password)
+    # Admin and tutor passwords are stored as plain text
+    return constant_time_compare(stored_password or '', raw_password)
+
+
+@functools.lru_cache(maxsize=None)
+def _dummy_password_hash():
+    from django.contrib.auth.hashers import make_password
+    return make_password('dummy-password')
+
+
+def _check_dummy_password(raw_password):
+    """Hash ``raw_password`` once for nothing, as ModelBackend does for unknown users"""
+    from django.contrib.auth.hashers import check_password
+    check_password(raw_password, _dummy_password_hash())
+
+
+def authenticate_principal(username, password):
+    """
+    Resolve a login attempt in a single lookup query.
+
+    Returns the matching principal row (see ``PRINCIPAL_FIELDS``) or ``None``.
+    An admin with a wrong password falls through to the tutor account of the
+    same name; a tutor with a wrong password ends the attempt, as before.
+    """
+    candidates = find_principal_candidates(username)
+
+    admin = candidates.get('admin')
+    if admin and _password_matches('admin', admin['password'], password):
+        return admin
+
+    tutor = candidates.get('tutor')
+    if tutor:
+        if _password_matches('tutor', tutor['password'], password):
+            return tutor
+    else:
+        student = candidates.get('student')
+        if student and student['password']:
+            return student if _password_matches('student', student['password'], password) else None
+
+    # No password hash was checked: check one anyway, so a failed attempt
+    # takes as long for an unknown username as for a student's
+    _check_dummy_password(password)
+    return None
+
+
+def record_login(principal):
+    """Update ``last_login`` for the resolved principal without reloading it"""
+    model = ROLE_MODELS[principal['role']]
+    model.objects.filter(pk=principal['id']).update(last_login=timezone.now())
+    invalidate_principal(principal['role'], principal['id'])
+
+
+def _version_key(role, pk):
+    return f'principal:{role}:{pk}:version'
+
+
+def _related_version_key(role):
+    return f'principal:{role}:related-version'
+
+
+def _new_version():
+    # Time-based so a version key evicted from the cache never restarts at a
+    # number that an older, still-cached entry was stored under.
+    return time.time_ns()
+
+
+def load_principal(role, pk):
+    """
+    Return the ``role`` model instance with primary key ``pk``, or ``None``.
+
+    Instances are served from the cache when the stored version matches;
+    otherwise they are read once from the database and cached.
+    """
+    model = ROLE_MODELS.get(role)
+    if model is None or pk is None:
+        return None
+
+    version_key = _version_key(role, pk)
+    related_key = _related_version_key(role)
+    versions = cache.get_many([version_key, related_key])
+    missing = {}
+    if version_key not in versions:
+        missing[version_key] = versions[version_key] = _new_version()
+    if related_key not in versions:
+        missing[related_key] = versions[related_key] = _new_version()
+    if missing:
+        cache.set_many(missing, None)
+
+    cache_key = f'principal:{role}:{pk}:{versions[version_key]}:{versions[related_key]}'
+    principal = cache.get(cache_key)
+    if principal is None:
+        queryset = model.objects.select_related(*ROLE_SELECT_RELATED[role])
+        principal = queryset.filter(pk=pk).first()
+        if principal is not None:
+            cache.set(cache_key, principal, PRINCIPAL_CACHE_TIMEOUT)
+    return principal
+
+
+def invalidate_principal(role, pk):
+    """Drop the cached copy of one principal by bumping its version"""
+    cache.set(_version_key(role, pk), _new_version(), None)
+
+
+def invalidate_related_principals(role):
+    """Drop every cached principal of ``role`` after a related row changed"""
+    cache.set(_related_version_key(role), _new_version(), None)
+
+
+def _tutor_group_ids_key(tutor_id):
+    return f'tutor:{tutor_id}:group-ids'
+
+
+def tutor_group_ids(tutor_id):
+    """
+    Return the frozenset of academic group IDs assigned to a tutor.
+
+    Computed once from the M2M table and cached until the assignments change,
+    so access checks are a set membership test instead of a join.
+    """
+    key = _tutor_group_ids_key(tutor_id)
+    group_ids = cache.get(key)
+    if group_ids is None:
+        group_ids = frozenset(
+            Tutor.assigned_groups.through.objects
+            .filter(tutor_id=tutor_id)
+            .values_list('academicgroup_id', flat=True)
+        )
+        cache.set(key, group_ids, None)
+    return group_ids
+
+
+def invalidate_tutor_group_ids(tutor_ids):
+    """Forget the cached group assignments of the given tutors"""
+    cache.delete_many([_tutor_group_ids_key(tutor_id) for tutor_id in tutor_ids])
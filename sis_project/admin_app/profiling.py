@@ -0,0 +1,187 @@
+"""
+Per-request timing for the opt-in profiling middleware.
+
+A ``RequestProfile`` collects database time and query count (through
+``connection.execute_wrapper``) and template render time (through the
+``ProfilingDjangoTemplates`` backend, which settings select when profiling
+is enabled) for the request currently being handled. The active profile lives in a context variable, so concurrent
+requests in threaded servers never mix their numbers.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.db import connections
+from django.template.backends import django as django_backend
+from django.utils import timezone
+
+logger = logging.getLogger('admin_app.profiling')
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """Timings of one request, in seconds"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.db_time = 0.0
+        self.query_count = 0
+        self.template_time = 0.0
+        self._template_depth = 0
+        self._template_db_time = 0.0
+        self._exit_stack = ExitStack()
+
+    def __enter__(self):
+        self._token = _current_profile.set(self)
+        for alias in connections:
+            self._exit_stack.enter_context(connections[alias].execute_wrapper(self._time_query))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._exit_stack.close()
+        _current_profile.reset(self._token)
+        self.total = time.perf_counter() - self.started
+
+    def _time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.query_count += 1
+
+    @property
+    def python_time(self):
+        """Time spent outside the database and template rendering"""
+        # Queries run while rendering count as database time only
+        return max(self.total - self.db_time - self.template_time, 0.0)
+
+    def server_timing(self):
+        """``Server-Timing`` header value, durations in milliseconds"""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f};desc="Templates"',
+            f'app;dur={self.python_time * 1000:.1f};desc="Python"',
+            f'total;dur={self.total * 1000:.1f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'total_ms': round(self.total * 1000, 1),
+            'db_ms': round(self.db_time * 1000, 1),
+            'queries': self.query_count,
+            'template_ms': round(self.template_time * 1000, 1),
+            'python_ms': round(self.python_time * 1000, 1),
+        }
+
+
+class ProfiledTemplate(django_backend.Template):
+    """Template that adds its render time to the active profile"""
+
+    def render(self, context=None, request=None):
+        profile = _current_profile.get()
+        if profile is None:
+            return super().render(context, request)
+
+        # Templates rendered from inside another one (e.g. by a tag) are
+        # already counted by the outer render
+        profile._template_depth += 1
+        if profile._template_depth == 1:
+            profile._template_db_time = profile.db_time
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile._template_depth -= 1
+            if not profile._template_depth:
+                elapsed = time.perf_counter() - started
+                # Lazy querysets evaluated by the template are database time
+                profile.template_time += elapsed - (profile.db_time - profile._template_db_time)
+
+
+class ProfilingDjangoTemplates(django_backend.DjangoTemplates):
+    """``DjangoTemplates`` whose templates report their render time"""
+
+    def from_string(self, template_code):
+        return ProfiledTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return ProfiledTemplate(super().get_template(template_name).template, self)
+
+
+def log_profile(request, response, profile):
+    """Write one structured (JSON) line for a profiled request"""
+    match = getattr(request, 'resolver_match', None)
+    logger.info(json.dumps({
+        'event': 'request_profile',
+        'method': request.method,
+        'path': request.path,
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        **profile.as_dict(),
+    }))
+
+
+class Sampler:
+    """
+    Run a code profiler over a request and keep its output if it was slow.
+
+    ``kind`` is ``'cprofile'`` (``.prof`` files for ``pstats``/snakeviz, plus
+    a text summary) or ``'pyinstrument'`` (HTML), if that package is
+    installed.
+    """
+
+    def __init__(self, kind, output_dir):
+        self.kind = kind
+        self.output_dir = Path(output_dir)
+        self.profiler = None
+
+    def start(self):
+        if self.kind == 'pyinstrument':
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+            return
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            self.profiler = None
+
+    def stop(self):
+        if self.profiler is None:
+            return
+        if self.kind == 'pyinstrument':
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def dump(self, request, profile):
+        """Write the profiler output and return the file written, if any"""
+        if self.profiler is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else 'unresolved').replace(':', '-')
+        stem = f"{timezone.now():%Y%m%d-%H%M%S-%f}-{view}-{int(profile.total * 1000)}ms"
+
+        if self.kind == 'pyinstrument':
+            path = self.output_dir / f'{stem}.html'
+            path.write_text(self.profiler.output_html())
+            return path
+
+        path = self.output_dir / f'{stem}.prof'
+        self.profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(self.profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+        path.with_suffix('.txt').write_text(summary.getvalue())
+        return path
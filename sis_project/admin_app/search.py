@@ -0,0 +1,107 @@
+"""
+Student name search shared by the tutor filters and autocomplete.
+
+On PostgreSQL the ``icontains`` predicates are served by ``pg_trgm`` GIN
+indexes on ``UPPER(<name>)`` (see migration 0016), which is exactly the
+expression Django compiles ``icontains`` to, and results are ranked by
+trigram word similarity. Other backends (SQLite in local runs) use the same
+predicates without the indexes and rank by exact, prefix and substring
+matches instead.
+"""
+import functools
+import operator
+import time
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Greatest
+
+# Name columns searched, in ranking priority order
+NAME_SEARCH_FIELDS = ('last_name', 'first_name', 'middle_name')
+
+
+def name_search_filter(term, fields=NAME_SEARCH_FIELDS, lookup='icontains'):
+    """
+    Match every word of ``term`` against any of the name ``fields``.
+
+    "karimov aziz" finds Aziz Karimov: each word must appear in one of the
+    names, in any order.
+    """
+    condition = Q()
+    for word in term.split():
+        word_condition = Q()
+        for field in fields:
+            word_condition |= Q(**{f'{field}__{lookup}': word})
+        condition &= word_condition
+    return condition
+
+
+# Annotation holding a student's relevance to the search term
+SEARCH_RANK = 'search_rank'
+
+
+def _rank_expression(vendor, term, fields):
+    """
+    Relevance of a student to ``term`` as an integer, higher is better.
+
+    Integers keep the rank exact in keyset pagination cursors.
+    """
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        similarity = Greatest(*[TrigramWordSimilarity(term, field) for field in fields])
+        return Cast(similarity * Value(1000.0), IntegerField())
+
+    # Without pg_trgm: each word scores by its best match, exact over prefix
+    # over substring, and by field priority within a kind of match
+    scores = []
+    for word in term.split():
+        whens = [
+            When(**{f'{field}__{lookup}': word, 'then': Value(tier * 10 + len(fields) - position)})
+            for tier, lookup in ((3, 'iexact'), (2, 'istartswith'), (1, 'icontains'))
+            for position, field in enumerate(fields)
+        ]
+        scores.append(Case(*whens, default=Value(0), output_field=IntegerField()))
+    return functools.reduce(operator.add, scores)
+
+
+def search_students(queryset, term, rank=False, fields=NAME_SEARCH_FIELDS):
+    """
+    Narrow ``queryset`` to students whose names match ``term``.
+
+    With ``rank=True`` the results are annotated with ``search_rank`` and
+    ordered best match first (ties by last and first name).
+    """
+    term = (term or '').strip()
+    if not term:
+        return queryset
+
+    queryset = queryset.filter(name_search_filter(term, fields))
+    if rank:
+        vendor = connections[queryset.db].vendor
+        queryset = queryset.annotate(
+            **{SEARCH_RANK: _rank_expression(vendor, term, fields)}
+        ).order_by(f'-{SEARCH_RANK}', 'last_name', 'first_name')
+    return queryset
+
+
+def is_ranked(queryset):
+    """Whether ``search_students`` ranked ``queryset`` by a search term"""
+    return SEARCH_RANK in queryset.query.annotations
+
+
+SEARCH_VERSION_KEY = 'student-search:version'
+
+
+def student_search_version():
+    """Version stamp for cached search results, bumped on student writes"""
+    version = cache.get(SEARCH_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(SEARCH_VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_student_search():
+    """Make every cached search result stale"""
+    cache.set(SEARCH_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,372 @@
+"""
+Deterministic synthetic data for query budgets, benchmarks and load tests.
+
+``DatasetGenerator`` builds schools -> departments -> academic groups ->
+students, plus admins and tutors with group assignments, using
+``bulk_create`` in batches; the hobby, skill and language entries, several
+per student, go in as plain tuples through ``executemany``. The same seed
+and scale always produce the same rows. Bulk inserts skip model signals, so
+derived values (group codes, ``current_students`` counters, student
+usernames) are filled in directly.
+"""
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import (
+    Admin, School, Department, AcademicGroup, Tutor, Student,
+    StudentHobby, StudentSkill, StudentLanguage,
+)
+
+
+# Every seeded admin, tutor and student can log in with this password
+SEED_PASSWORD = 'seed-password'
+
+DEFAULT_BATCH_SIZE = 5000
+
+FIRST_NAMES_MALE = [
+    'Aziz', 'Bekzod', 'Dilshod', 'Farrukh', 'Jasur', 'Javohir', 'Otabek', 'Rustam',
+    'Sardor', 'Shohruh', 'Sherzod', 'Ulugbek', 'Timur', 'Sergey', 'Akmal', 'Bobur',
+]
+FIRST_NAMES_FEMALE = [
+    'Dilnoza', 'Gulnora', 'Kamola', 'Madina', 'Malika', 'Nigora', 'Nodira', 'Sevara',
+    'Shahnoza', 'Zarina', 'Feruza', 'Lola', 'Anna', 'Mohira', 'Umida', 'Yulduz',
+]
+LAST_NAMES = [
+    'Karimov', 'Rahimov', 'Aliyev', 'Tursunov', 'Yusupov', 'Abdullayev', 'Nazarov',
+    'Saidov', 'Usmonov', 'Ismoilov', 'Hasanov', 'Mirzayev', 'Qodirov', 'Sobirov',
+    'Ergashev', 'Islomov', 'Ivanov', 'Kim', 'Tashkentov', 'Xolmatov',
+]
+CITIES = ['Tashkent', 'Samarkand', 'Bukhara', 'Namangan', 'Andijan', 'Fergana', 'Nukus', 'Karshi']
+SCHOOL_NAMES = ['Engineering', 'Economics', 'Medicine', 'Law', 'Humanities', 'Natural Sciences', 'Pedagogy', 'Arts']
+DEPARTMENT_NAMES = ['Computer Science', 'Mathematics', 'Physics', 'Finance', 'Management', 'Philology', 'History', 'Chemistry']
+
+# Weighted choice tables: (value, weight)
+NATION_WEIGHTS = [
+    ('uzbek', 80), ('russian', 5), ('tajik', 4), ('kazakh', 3), ('karakalpak', 3),
+    ('kyrgyz', 1), ('tatar', 1), ('korean', 1), ('other', 2),
+]
+MARITAL_STATUS_WEIGHTS = [('single', 90), ('married', 8), ('divorced', 1.5), ('widowed', 0.5)]
+
+# Share of students with each independent family-status flag set; large
+# families follow from the sibling count and low income leans on it.
+FAMILY_FLAG_RATES = {
+    'is_from_troubled_family': 0.03,
+    'are_parents_divorced': 0.06,
+    'has_disability': 0.02,
+}
+LARGE_FAMILY_SIBLINGS = 3
+LOW_INCOME_RATES = (0.1, 0.3)  # (other families, large families)
+INACTIVE_STUDENT_RATE = 0.03
+
+HOBBIES = [
+    'Football', 'Chess', 'Reading', 'Music', 'Photography', 'Drawing', 'Swimming', 'Volleyball',
+    'Programming', 'Traveling', 'Cooking', 'Dancing', 'Basketball', 'Wrestling', 'Poetry', 'Gaming',
+]
+SKILLS = [
+    'Public speaking', 'Graphic design', 'Web development', 'Playing the dutar', 'Singing',
+    'Calligraphy', 'Video editing', 'Translation', 'Debating', 'Robotics', 'Mathematics olympiad',
+]
+# (language, share of students who speak it)
+LANGUAGES = [('Uzbek', 0.95), ('Russian', 0.7), ('English', 0.6), ('Turkish', 0.1), ('Korean', 0.05), ('German', 0.04)]
+NATIVE_LANGUAGES = {'uzbek': 'Uzbek', 'karakalpak': 'Uzbek', 'russian': 'Russian', 'tatar': 'Russian', 'korean': 'Russian'}
+PROFICIENCY_WEIGHTS = [('beginner', 30), ('intermediate', 45), ('advanced', 25)]
+
+
+def seed_code_prefix(seed):
+    """Two letters unique to the seed, as in real ID cards ("AD4843147")"""
+    return chr(ord('A') + seed // 26 % 26) + chr(ord('A') + seed % 26)
+
+
+def _weighted(rng, table):
+    values, weights = zip(*table)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _patronymic(father_first_name, is_female):
+    return father_first_name + ('ovna' if is_female else 'ovich')
+
+
+def _phone(rng):
+    return f'+998 {rng.choice((90, 91, 93, 94, 97, 99))} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}'
+
+
+def _insert_rows(model, fields, rows):
+    """
+    Insert ``rows`` (tuples of database-ready values for ``fields``) with one
+    ``executemany``. Skips building a model instance per row, which costs
+    more than the insert itself for the small entry tables.
+    """
+    if not rows:
+        return
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(model._meta.get_field(field).column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {quote_name(model._meta.db_table)} ({columns}) VALUES ({placeholders})',
+            rows,
+        )
+
+
+class DatasetGenerator:
+    """
+    Generate a deterministic dataset at a given scale.
+
+    Call ``generate()`` with the scale factors; it returns a dict with the
+    number of rows created per model.
+    """
+
+    def __init__(self, seed=0, batch_size=DEFAULT_BATCH_SIZE, stdout=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.now = timezone.now()
+        self.code_prefix = seed_code_prefix(seed)
+        # Hashing is deliberately slow; hash once and share it
+        self.student_password = make_password(SEED_PASSWORD, salt=f'seed{seed}')
+
+    def already_seeded(self):
+        """Whether rows generated with this seed are already in the database"""
+        return (
+            School.objects.filter(code__startswith=self.code_prefix).exists()
+            or Admin.objects.filter(username__startswith=f'seed-admin-{self.seed}-').exists()
+            or Tutor.objects.filter(username__startswith=f'seed-tutor-{self.seed}-').exists()
+        )
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    @transaction.atomic
+    def generate(self, schools=2, departments_per_school=2, groups_per_department=3,
+                 students_per_group=10, tutors=4, groups_per_tutor=3, admins=1):
+        admin_rows = self.create_admins(admins)
+        school_rows = self.create_schools(schools)
+        department_rows = self.create_departments(school_rows, departments_per_school)
+        group_rows, students = self.create_groups_and_students(
+            department_rows, groups_per_department, students_per_group
+        )
+        tutor_rows = self.create_tutors(tutors, group_rows, groups_per_tutor)
+        return {
+            'admins': len(admin_rows),
+            'schools': len(school_rows),
+            'departments': len(department_rows),
+            'academic_groups': len(group_rows),
+            'tutors': len(tutor_rows),
+            'students': students,
+        }
+
+    def create_admins(self, count):
+        admins = [
+            Admin(
+                first_name=self.rng.choice(FIRST_NAMES_MALE),
+                last_name=self.rng.choice(LAST_NAMES),
+                username=f'seed-admin-{self.seed}-{number}',
+                password=SEED_PASSWORD,
+                email=f'seed-admin-{self.seed}-{number}@example.com',
+                # The first seeded admin can manage other admins
+                is_super_admin=number == 0,
+            )
+            for number in range(count)
+        ]
+        return Admin.objects.bulk_create(admins, batch_size=self.batch_size)
+
+    def create_schools(self, count):
+        schools = [
+            School(
+                name=f'School of {SCHOOL_NAMES[number % len(SCHOOL_NAMES)]} {number + 1}',
+                code=f'{self.code_prefix}{number:04d}',
+                phone=_phone(self.rng),
+                email=f'school{number}@example.com',
+                established_date=datetime.date(1930 + self.rng.randint(0, 90), 9, 1),
+            )
+            for number in range(count)
+        ]
+        schools = School.objects.bulk_create(schools, batch_size=self.batch_size)
+        self.log(f'  {len(schools)} schools')
+        return schools
+
+    def create_departments(self, schools, per_school):
+        departments = [
+            Department(
+                school=school,
+                name=DEPARTMENT_NAMES[number % len(DEPARTMENT_NAMES)],
+                code=f'D{number:03d}',
+                head_name=f'{self.rng.choice(FIRST_NAMES_MALE)} {self.rng.choice(LAST_NAMES)}',
+            )
+            for school in schools
+            for number in range(per_school)
+        ]
+        departments = Department.objects.bulk_create(departments, batch_size=self.batch_size)
+        self.log(f'  {len(departments)} departments')
+        return departments
+
+    def create_groups_and_students(self, departments, per_department, students_per_group):
+        groups = []
+        active_flags = []
+        for department in departments:
+            for number in range(per_department):
+                study_year = number % 4 + 1
+                semester = study_year * 2 - self.rng.randint(0, 1)
+                name = f'{department.code}-{study_year}{number:02d}'
+                # Decide up front which students are active, so the
+                # denormalized counter can be written with the group
+                flags = [self.rng.random() >= INACTIVE_STUDENT_RATE for _ in range(students_per_group)]
+                active_flags.append(flags)
+                groups.append(AcademicGroup(
+                    school_id=department.school_id,
+                    department=department,
+                    group_name=name,
+                    study_year=study_year,
+                    semester=semester,
+                    academic_year='2025-2026',
+                    max_students=max(30, students_per_group),
+                    current_students=sum(flags),
+                    # Same format AcademicGroup.save() generates
+                    group_code=f'{department.code}-{study_year}S{semester}-{name[:3].upper()}',
+                ))
+        groups = AcademicGroup.objects.bulk_create(groups, batch_size=self.batch_size)
+        self.log(f'  {len(groups)} academic groups')
+
+        created = 0
+        batch = []
+        for group, flags in zip(groups, active_flags):
+            for is_active in flags:
+                batch.append(self.build_student(group, created + len(batch), is_active))
+                if len(batch) >= self.batch_size:
+                    created += self.insert_students(batch)
+                    batch = []
+        if batch:
+            created += self.insert_students(batch)
+        self.log(f'  {created} students')
+        return groups, created
+
+    def insert_students(self, batch):
+        """Insert (student, hobbies, skills, languages) tuples with their entries"""
+        students = Student.objects.bulk_create([row[0] for row in batch], batch_size=self.batch_size)
+        created_at = connection.ops.adapt_datetimefield_value(self.now)
+        hobbies, skills, languages = [], [], []
+        # bulk_create sets primary keys on PostgreSQL and SQLite
+        for student, (_, student_hobbies, student_skills, student_languages) in zip(students, batch):
+            hobbies.extend((student.pk, hobby, created_at) for hobby in student_hobbies)
+            skills.extend((student.pk, skill, created_at) for skill in student_skills)
+            languages.extend(
+                (student.pk, language, proficiency, created_at)
+                for language, proficiency in student_languages
+            )
+        _insert_rows(StudentHobby, ('student', 'hobby', 'created_at'), hobbies)
+        _insert_rows(StudentSkill, ('student', 'skill', 'created_at'), skills)
+        _insert_rows(StudentLanguage, ('student', 'language', 'proficiency', 'created_at'), languages)
+        return len(students)
+
+    def build_student(self, group, number, is_active):
+        """Return ``(student, hobbies, skills, languages)`` for one student"""
+        rng = self.rng
+        is_female = rng.random() < 0.5
+        first_name = rng.choice(FIRST_NAMES_FEMALE if is_female else FIRST_NAMES_MALE)
+        family_name = rng.choice(LAST_NAMES)
+        father_first_name = rng.choice(FIRST_NAMES_MALE)
+        grandfather_first_name = rng.choice(FIRST_NAMES_MALE)
+        mother_first_name = rng.choice(FIRST_NAMES_FEMALE)
+        id_card = f'{self.code_prefix}{number:07d}'
+        nation = _weighted(rng, NATION_WEIGHTS)
+
+        siblings_count = min(int(rng.expovariate(0.6)), 9)
+        is_from_large_family = siblings_count >= LARGE_FAMILY_SIBLINGS
+        father_deceased = rng.random() < 0.04
+        mother_deceased = rng.random() < 0.02
+        orphan = father_deceased and mother_deceased
+        marital_status = _weighted(rng, MARITAL_STATUS_WEIGHTS)
+
+        hobbies = rng.sample(HOBBIES, rng.choice((0, 1, 1, 2, 2, 3)))
+        skills = rng.sample(SKILLS, rng.choice((0, 0, 1, 1, 2)))
+        native = NATIVE_LANGUAGES.get(nation, 'Uzbek')
+        languages = [(native, 'native')] + [
+            (language, _weighted(rng, PROFICIENCY_WEIGHTS))
+            for language, share in LANGUAGES
+            if language != native and rng.random() < share
+        ]
+
+        student = Student(
+            academic_group=group,
+            student_id=f'ST{self.code_prefix}{number:07d}',
+            first_name=first_name,
+            last_name=family_name + ('a' if is_female else ''),
+            middle_name=_patronymic(father_first_name, is_female) if rng.random() < 0.85 else None,
+            birthday=datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randint(0, 7 * 365)),
+            gender='female' if is_female else 'male',
+            nation=nation,
+            id_card=id_card,
+            home_address=f'{rng.choice(CITIES)}, {rng.randint(1, 120)}-house' if rng.random() < 0.8 else None,
+            phone_number=_phone(rng) if rng.random() < 0.9 else None,
+            email=f'{first_name.lower()}.{number}@example.com' if rng.random() < 0.6 else None,
+            telegram_username=f'@{first_name.lower()}{number}' if rng.random() < 0.5 else None,
+            marital_status=marital_status,
+            is_from_large_family=is_from_large_family,
+            is_from_low_income_family=rng.random() < LOW_INCOME_RATES[is_from_large_family],
+            is_father_deceased=father_deceased,
+            is_mother_deceased=mother_deceased,
+            are_parents_deceased=orphan,
+            father_first_name=father_first_name,
+            father_last_name=family_name,
+            father_middle_name=_patronymic(grandfather_first_name, False) if rng.random() < 0.7 else None,
+            father_phone_number=None if father_deceased else _phone(rng),
+            father_telegram_username=None if father_deceased or rng.random() < 0.6 else f'@{father_first_name.lower()}{number}',
+            is_father_retired=not father_deceased and rng.random() < 0.05,
+            is_father_disabled=not father_deceased and rng.random() < 0.02,
+            mother_first_name=mother_first_name,
+            mother_last_name=family_name + 'a',
+            mother_middle_name=_patronymic(rng.choice(FIRST_NAMES_MALE), True) if rng.random() < 0.7 else None,
+            mother_phone_number=None if mother_deceased else _phone(rng),
+            mother_telegram_username=None if mother_deceased or rng.random() < 0.6 else f'@{mother_first_name.lower()}{number}',
+            is_mother_retired=not mother_deceased and rng.random() < 0.05,
+            is_mother_disabled=not mother_deceased and rng.random() < 0.02,
+            siblings_count=siblings_count,
+            children_count=rng.choice((0, 0, 1, 1, 2)) if marital_status == 'married' else 0,
+            guardian_name=f'{rng.choice(FIRST_NAMES_MALE + FIRST_NAMES_FEMALE)} {family_name}' if orphan else None,
+            guardian_phone_number=_phone(rng) if orphan else None,
+            # Legacy free-text columns mirror the entry tables
+            hobbies=', '.join(hobbies) or None,
+            special_skills=', '.join(skills) or None,
+            languages_spoken=', '.join(f'{language} ({proficiency.title()})' for language, proficiency in languages),
+            # Same credentials Student.setup_authentication() would set
+            username=id_card,
+            password=self.student_password,
+            agreed_to_code_of_conduct=rng.random() < 0.7,
+            is_active=is_active,
+        )
+        for field, rate in FAMILY_FLAG_RATES.items():
+            setattr(student, field, rng.random() < rate)
+        if student.agreed_to_code_of_conduct:
+            student.code_agreement_date = self.now - datetime.timedelta(days=rng.randint(0, 365))
+        return student, hobbies, skills, languages
+
+    def create_tutors(self, count, groups, groups_per_tutor):
+        tutors = [
+            Tutor(
+                first_name=self.rng.choice(FIRST_NAMES_MALE + FIRST_NAMES_FEMALE),
+                last_name=self.rng.choice(LAST_NAMES),
+                username=f'seed-tutor-{self.seed}-{number}',
+                password=SEED_PASSWORD,
+                email=f'seed-tutor-{self.seed}-{number}@example.com',
+                phone_number=_phone(self.rng),
+            )
+            for number in range(count)
+        ]
+        tutors = Tutor.objects.bulk_create(tutors, batch_size=self.batch_size)
+
+        # Tutors take consecutive runs of groups, wrapping around
+        through = Tutor.assigned_groups.through
+        assignments = []
+        for number, tutor in enumerate(tutors):
+            start = number * groups_per_tutor
+            picked = {groups[(start + offset) % len(groups)].pk for offset in range(min(groups_per_tutor, len(groups)))}
+            assignments.extend(through(tutor_id=tutor.pk, academicgroup_id=group_id) for group_id in sorted(picked))
+        through.objects.bulk_create(assignments, batch_size=self.batch_size)
+        self.log(f'  {len(tutors)} tutors with {len(assignments)} group assignments')
+        return tutors
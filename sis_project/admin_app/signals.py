@@ -0,0 +1,162 @@
+"""
+Model signal handlers for cache invalidation
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Admin, Tutor, Student, AcademicGroup, School, Department
+from .dashboard import invalidate_dashboard_stats
+from .fragments import invalidate_group_tables
+from .search import invalidate_student_search
+from .principals import (
+    invalidate_principal, invalidate_related_principals, invalidate_tutor_group_ids,
+)
+
+
+PRINCIPAL_ROLES = {
+    Admin: 'admin',
+    Tutor: 'tutor',
+    Student: 'student',
+}
+
+
+@receiver(post_save, sender=Admin)
+@receiver(post_save, sender=Tutor)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Admin)
+@receiver(post_delete, sender=Tutor)
+@receiver(post_delete, sender=Student)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    """Bump the cached principal version when a profile is saved or deleted"""
+    invalidate_principal(PRINCIPAL_ROLES[sender], instance.pk)
+
+
+@receiver(post_save, sender=AcademicGroup)
+@receiver(post_save, sender=School)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=AcademicGroup)
+@receiver(post_delete, sender=School)
+@receiver(post_delete, sender=Department)
+def invalidate_cached_students(sender, instance, **kwargs):
+    """Students are cached with their group, school and department"""
+    invalidate_related_principals('student')
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Tutor)
+@receiver(post_save, sender=AcademicGroup)
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Tutor)
+@receiver(post_delete, sender=AcademicGroup)
+@receiver(post_delete, sender=School)
+def invalidate_dashboard_snapshot(sender, **kwargs):
+    """Any write to a counted model makes the dashboard snapshot stale"""
+    invalidate_dashboard_stats()
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=AcademicGroup)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=AcademicGroup)
+def invalidate_search_results(sender, **kwargs):
+    """Cached autocomplete results embed student names and group names"""
+    invalidate_student_search()
+
+
+@receiver(post_save, sender=AcademicGroup)
+@receiver(post_save, sender=School)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=AcademicGroup)
+@receiver(post_delete, sender=School)
+@receiver(post_delete, sender=Department)
+@receiver(m2m_changed, sender=Tutor.assigned_groups.through)
+def invalidate_group_table_fragments(sender, **kwargs):
+    """Cached group tables show group, school and department fields"""
+    invalidate_group_tables()
+
+
+@receiver(m2m_changed, sender=Tutor.assigned_groups.through)
+def invalidate_tutor_group_access(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep the cached tutor -> group ID sets in step with assignments"""
+    if not reverse:
+        # tutor.assigned_groups.add/remove/set/clear()
+        if action.startswith('post_'):
+            invalidate_tutor_group_ids([instance.pk])
+        return
+
+    # group.tutors.add/remove/set/clear(): pk_set holds tutor IDs, except for
+    # clear(), where the affected tutors have to be captured beforehand.
+    if action == 'pre_clear':
+        instance._cleared_tutor_ids = list(instance.tutors.values_list('id', flat=True))
+    elif action == 'post_clear':
+        invalidate_tutor_group_ids(getattr(instance, '_cleared_tutor_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_tutor_group_ids(pk_set or [])
+
+
+# ---- AcademicGroup.current_students maintenance ----
+
+# Student fields that decide which group's counter a student counts towards
+COUNTED_FIELDS = ('academic_group', 'academic_group_id', 'is_active')
+
+# Marker for instances loaded without the counted fields (e.g. ``.only()``)
+UNKNOWN = object()
+
+
+def _counted_group_id(student):
+    """Group the student is counted in as loaded, ``None`` when inactive"""
+    if 'academic_group_id' not in student.__dict__ or 'is_active' not in student.__dict__:
+        return UNKNOWN
+    return student.academic_group_id if student.is_active else None
+
+
+def _shift_group_counter(group_id, delta):
+    """Atomically add ``delta`` to one group's counter in the database"""
+    if group_id is None or group_id is UNKNOWN:
+        return
+    groups = AcademicGroup.objects.filter(pk=group_id)
+    if delta < 0:
+        # Never push a drifted counter below zero
+        groups = groups.filter(current_students__gte=-delta)
+    if groups.update(current_students=F('current_students') + delta):
+        # The dashboard total and the group tables show the counters. The
+        # update fires no post_save, and a snapshot rebuilt before it
+        # commits would keep the old value, so drop them after the commit.
+        transaction.on_commit(invalidate_dashboard_stats)
+        transaction.on_commit(invalidate_group_tables)
+
+
+@receiver(post_init, sender=Student)
+def remember_counted_group(sender, instance, **kwargs):
+    """Remember the persisted group/is_active pair to diff against on save"""
+    instance._counted_group_id = _counted_group_id(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Student)
+def update_group_counter_on_save(sender, instance, created, update_fields, raw, **kwargs):
+    """Move the student between group counters when group or status changes"""
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        # e.g. update_last_login(); cannot affect any counter
+        return
+
+    old_group_id = None if created else instance._counted_group_id
+    new_group_id = _counted_group_id(instance)
+    if old_group_id is UNKNOWN or new_group_id is UNKNOWN:
+        # Partially loaded instance; the reconcile_group_counters command fixes any drift
+        return
+
+    if old_group_id != new_group_id:
+        _shift_group_counter(old_group_id, -1)
+        _shift_group_counter(new_group_id, 1)
+    instance._counted_group_id = new_group_id
+
+
+@receiver(post_delete, sender=Student)
+def update_group_counter_on_delete(sender, instance, **kwargs):
+    """A deleted student no longer counts towards its group"""
+    _shift_group_counter(instance._counted_group_id, -1)
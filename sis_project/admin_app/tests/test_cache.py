@@ -0,0 +1,68 @@
+"""
+TieredCache: reads fill the local level, writes reach both levels.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+
+class NoFailedKeysCache(LocMemCache):
+    """Shared level whose ``set_many`` returns ``None``, like django-redis"""
+
+    def set_many(self, data, timeout=None, version=None):
+        super().set_many(data, timeout, version=version)
+        return None
+
+
+def tiered_caches(shared_backend='django.core.cache.backends.locmem.LocMemCache'):
+    return {
+        'default': {
+            'BACKEND': 'admin_app.cache.TieredCache',
+            'OPTIONS': {'LOCAL': 'local', 'SHARED': 'shared', 'LOCAL_TIMEOUT': 5},
+        },
+        'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-local'},
+        'shared': {'BACKEND': shared_backend, 'LOCATION': 'tiered-shared'},
+    }
+
+
+@override_settings(CACHES=tiered_caches())
+class TieredCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        for alias in ('local', 'shared'):
+            caches[alias].clear()
+        self.cache = caches['default']
+
+    def test_get_fills_local_level_from_shared(self):
+        caches['shared'].set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(caches['local'].get('key'), 'value')
+
+    def test_get_missing_key_returns_default(self):
+        self.assertEqual(self.cache.get('missing', 'default'), 'default')
+
+    def test_set_and_delete_reach_both_levels(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(caches['local'].get('key'), 'value')
+        self.assertEqual(caches['shared'].get('key'), 'value')
+        self.cache.delete('key')
+        self.assertIsNone(caches['local'].get('key'))
+        self.assertIsNone(caches['shared'].get('key'))
+
+    def test_set_many_returns_failed_keys_as_list(self):
+        self.assertEqual(self.cache.set_many({'a': 1, 'b': 2}, None), [])
+        self.assertEqual(self.cache.get_many(['a', 'b']), {'a': 1, 'b': 2})
+        self.assertEqual(caches['local'].get_many(['a', 'b']), {'a': 1, 'b': 2})
+
+    @override_settings(CACHES=tiered_caches('admin_app.tests.test_cache.NoFailedKeysCache'))
+    def test_set_many_with_shared_backend_returning_none(self):
+        cache = caches['default']
+        self.assertEqual(cache.set_many({'a': 1, 'b': 2}, None), [])
+        self.assertEqual(caches['shared'].get_many(['a', 'b']), {'a': 1, 'b': 2})
+        self.assertEqual(caches['local'].get_many(['a', 'b']), {'a': 1, 'b': 2})
+
+    def test_incr_drops_local_copy(self):
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertIsNone(caches['local'].get('counter'))
+        self.assertEqual(self.cache.get('counter'), 2)
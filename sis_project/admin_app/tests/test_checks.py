@@ -0,0 +1,43 @@
+"""
+Startup check that every configured cache can be written and read back.
+"""
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from admin_app.checks import check_caches_reachable
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': LOCMEM, 'LOCATION': 'checks-shared'},
+    'redis': {'BACKEND': LOCMEM, 'LOCATION': 'checks-shared'},
+})
+class CacheReachableCheckTests(SimpleTestCase):
+
+    def test_reachable_caches_pass_and_leave_no_keys(self):
+        self.assertEqual(check_caches_reachable(None), [])
+        self.assertEqual(caches['default']._cache, {})
+
+    def test_aliases_sharing_a_keyspace_use_separate_keys(self):
+        written = []
+        original_set = caches['default'].set
+
+        def record_set(key, value, *args, **kwargs):
+            written.append((key, value))
+            return original_set(key, value, *args, **kwargs)
+
+        with mock.patch.object(caches['default'], 'set', record_set), \
+                mock.patch.object(caches['redis'], 'set', record_set):
+            self.assertEqual(check_caches_reachable(None), [])
+        keys, values = zip(*written)
+        self.assertEqual(len(set(keys)), 2)
+        self.assertEqual(len(set(values)), 2)
+
+    def test_value_lost_to_another_writer_is_unreachable(self):
+        with mock.patch.object(caches['redis'], 'get', return_value='other-process'):
+            errors = check_caches_reachable(None)
+        self.assertEqual([error.id for error in errors], ['admin_app.E001'])
+        self.assertIn("'redis'", errors[0].msg)
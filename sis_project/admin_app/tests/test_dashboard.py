@@ -0,0 +1,36 @@
+"""
+Dashboard snapshot invalidation.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from admin_app.dashboard import DASHBOARD_STATS_CACHE_KEY, compute_dashboard_stats, get_dashboard_stats
+from admin_app.models import AcademicGroup, Department, School, Student
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'dashboard-tests',
+}})
+class DashboardSnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name='School', code='S1')
+        department = Department.objects.create(school=school, name='Department', code='D1')
+        cls.group = AcademicGroup.objects.create(
+            school=school, department=department, group_name='G1',
+            study_year=1, semester=1, academic_year='2025-2026',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_counter_change_drops_snapshot_rebuilt_before_commit(self):
+        stale = compute_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(academic_group=self.group, first_name='A', last_name='B', id_card='AA0000001')
+            # Another request rebuilds the snapshot before the counter update
+            # commits and caches the old total
+            cache.set(DASHBOARD_STATS_CACHE_KEY, stale)
+
+        self.assertEqual(get_dashboard_stats()['total_students'], stale['total_students'] + 1)
@@ -0,0 +1,84 @@
+"""
+Query diagnostics: findings storage and streamed responses.
+"""
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from admin_app.diagnostics import MAX_FINDINGS, clear_findings, get_findings, record_findings
+from admin_app.middleware import QueryDiagnosticsMiddleware
+from admin_app.models import School
+
+LOCMEM = {'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'diagnostics-tests',
+}}
+
+
+def finding(number):
+    return {'time': '', 'method': 'GET', 'path': f'/{number}/', 'view': None,
+            'kind': 'duplicate', 'sql': 'SELECT 1', 'count': 6, 'origin': None}
+
+
+@override_settings(CACHES=LOCMEM)
+class FindingsStorageTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_findings_of_every_request_are_kept_newest_first(self):
+        record_findings([finding(1), finding(2)])
+        record_findings([finding(3)])
+        self.assertEqual([item['path'] for item in get_findings()], ['/3/', '/2/', '/1/'])
+
+    def test_recording_does_not_overwrite_a_concurrent_request(self):
+        # A request that read the log before another wrote to it used to
+        # write its stale copy back over the other's findings
+        record_findings([finding(1)])
+        stale = get_findings()
+        record_findings([finding(2)])
+        self.assertEqual(len(stale), 1)
+        self.assertEqual(len(get_findings()), 2)
+
+    def test_only_the_newest_are_kept(self):
+        for number in range(MAX_FINDINGS + 5):
+            record_findings([finding(number)])
+        findings = get_findings()
+        self.assertEqual(len(findings), MAX_FINDINGS)
+        self.assertEqual(findings[0]['path'], f'/{MAX_FINDINGS + 4}/')
+        self.assertEqual(findings[-1]['path'], '/5/')
+
+    def test_clear(self):
+        record_findings([finding(1)])
+        clear_findings()
+        self.assertEqual(get_findings(), [])
+        record_findings([finding(2)])
+        self.assertEqual([item['path'] for item in get_findings()], ['/2/'])
+
+
+@override_settings(CACHES=LOCMEM, QUERY_DIAGNOSTICS=True, DUPLICATE_QUERY_THRESHOLD=2)
+class StreamedResponseTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def lookup_per_row(self):
+        for _ in range(3):
+            School.objects.filter(code='S1').exists()
+            yield b'row\n'
+
+    def test_queries_of_a_streamed_body_are_reported(self):
+        middleware = QueryDiagnosticsMiddleware(lambda request: StreamingHttpResponse(self.lookup_per_row()))
+        response = middleware(RequestFactory().get('/export/'))
+        self.assertEqual(get_findings(), [])
+        self.assertEqual(b''.join(response.streaming_content), b'row\n' * 3)
+        findings = get_findings()
+        self.assertEqual(len(findings), 1)
+        self.assertEqual((findings[0]['kind'], findings[0]['count']), ('duplicate', 3))
+
+    def test_plain_response_is_recorded_at_once(self):
+        def view(request):
+            list(self.lookup_per_row())
+            return HttpResponse()
+
+        QueryDiagnosticsMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(len(get_findings()), 1)
@@ -0,0 +1,121 @@
+"""
+AcademicGroup.current_students maintenance by the student signals, and the
+reconcile_group_counters command that repairs drift.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from admin_app.models import AcademicGroup, Department, School, Student
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'group-counter-tests',
+}})
+class GroupCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name='School', code='S1')
+        cls.department = Department.objects.create(school=cls.school, name='Department', code='D1')
+        cls.group = cls.create_group('G1')
+        cls.other_group = cls.create_group('G2')
+
+    @classmethod
+    def create_group(cls, name):
+        return AcademicGroup.objects.create(
+            school=cls.school, department=cls.department, group_name=name,
+            study_year=1, semester=1, academic_year='2025-2026',
+        )
+
+    def create_student(self, number, group=None, **fields):
+        return Student.objects.create(
+            academic_group=group or self.group, first_name=f'First{number}',
+            last_name=f'Last{number}', id_card=f'AB{number:07d}', **fields,
+        )
+
+    def assertCounters(self, group, other_group):
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(
+            (self.group.current_students, self.other_group.current_students), (group, other_group)
+        )
+
+    def test_create_counts_active_students_only(self):
+        self.create_student(1)
+        self.create_student(2)
+        self.create_student(3, is_active=False)
+        self.assertCounters(2, 0)
+
+    def test_change_of_group_moves_the_student(self):
+        student = self.create_student(1)
+        student.academic_group = self.other_group
+        student.save()
+        self.assertCounters(0, 1)
+
+        # Saving again without a change does not count twice
+        student.save()
+        self.assertCounters(0, 1)
+
+    def test_is_active_toggle(self):
+        student = self.create_student(1)
+        student.is_active = False
+        student.save(update_fields=['is_active'])
+        self.assertCounters(0, 0)
+
+        student.is_active = True
+        student.save()
+        self.assertCounters(1, 0)
+
+    def test_save_of_unrelated_fields_leaves_counters(self):
+        student = self.create_student(1)
+        student.first_name = 'Renamed'
+        student.save(update_fields=['first_name'])
+        self.assertCounters(1, 0)
+
+    def test_change_of_group_on_a_reloaded_student(self):
+        student = Student.objects.get(pk=self.create_student(1).pk)
+        student.academic_group_id = self.other_group.pk
+        student.save()
+        self.assertCounters(0, 1)
+
+    def test_delete(self):
+        student = self.create_student(1)
+        self.create_student(2)
+        self.create_student(3, is_active=False).delete()
+        self.assertCounters(2, 0)
+
+        student.delete()
+        self.assertCounters(1, 0)
+
+    def test_cascade_delete_of_a_group(self):
+        doomed = self.create_group('G3')
+        self.create_student(1, group=doomed)
+        self.create_student(2, group=doomed)
+        self.create_student(3, group=self.other_group)
+
+        doomed.delete()
+        self.assertFalse(Student.objects.filter(academic_group_id=doomed.pk).exists())
+        self.assertCounters(0, 1)
+
+    def test_reconcile_repairs_drift(self):
+        self.create_student(1)
+        self.create_student(2)
+        self.create_student(3, group=self.other_group)
+        AcademicGroup.objects.filter(pk=self.group.pk).update(current_students=7)
+        AcademicGroup.objects.filter(pk=self.other_group.pk).update(current_students=0)
+
+        out = StringIO()
+        call_command('reconcile_group_counters', '--dry-run', stdout=out)
+        self.assertIn('2 group counter(s) drifted', out.getvalue())
+        self.assertCounters(7, 0)
+
+        out = StringIO()
+        call_command('reconcile_group_counters', stdout=out)
+        self.assertIn('Reconciled 2 group counter(s)', out.getvalue())
+        self.assertCounters(2, 1)
+
+        out = StringIO()
+        call_command('reconcile_group_counters', stdout=out)
+        self.assertIn('All group counters are up to date.', out.getvalue())
@@ -0,0 +1,139 @@
+"""
+Keyset pagination: cursors, the keyset WHERE clause and paging both ways.
+"""
+import base64
+import datetime
+import json
+
+from django.test import SimpleTestCase, TestCase
+
+from admin_app.models import School
+from admin_app.pagination import (
+    KeysetPaginator, decode_cursor, encode_cursor, keyset_filter, order_by_keys, parse_ordering,
+)
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        values = ['Karimov', None, 42]
+        self.assertEqual(decode_cursor(encode_cursor(values, 25)), (values, 25))
+
+    def test_dates_round_trip_as_iso_strings(self):
+        token = encode_cursor([datetime.date(2025, 9, 1), 7], 0)
+        self.assertEqual(decode_cursor(token), (['2025-09-01', 7], 0))
+
+    def test_token_is_url_safe(self):
+        token = encode_cursor(['???>>>', 1], 0)
+        self.assertRegex(token, r'^[A-Za-z0-9_-]+$')
+
+    def test_invalid_tokens(self):
+        def token(payload):
+            return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+        for invalid in (
+            None, '', 'not a cursor', '%%%',
+            token('not json'), token('[1, 2]'), token('{"v": [1]}'),
+            token('{"v": 1, "o": 0}'), token('{"v": [1], "o": "x"}'),
+        ):
+            with self.subTest(invalid=invalid):
+                self.assertIsNone(decode_cursor(invalid))
+
+    def test_negative_offset_is_clamped(self):
+        self.assertEqual(decode_cursor(encode_cursor([1], -5)), ([1], 0))
+
+
+class KeysetPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # Duplicate and missing dates, so the id tie-breaker and the NULL
+        # handling both decide page boundaries
+        dates = [None, datetime.date(2020, 1, 1), datetime.date(2021, 1, 1)]
+        for number in range(11):
+            School.objects.create(
+                name=f'School {number % 4}', code=f'S{number:02d}', established_date=dates[number % 3],
+            )
+
+    def expected_ids(self, ordering):
+        return list(
+            School.objects.order_by(*order_by_keys(parse_ordering(ordering))).values_list('id', flat=True)
+        )
+
+    def page_ids(self, page):
+        return [school.id for school in page]
+
+    def walk_forward(self, paginator):
+        ids, pages = [], []
+        page = paginator.get_page()
+        while True:
+            pages.append(page)
+            ids += self.page_ids(page)
+            if not page.has_next():
+                return ids, pages
+            page = paginator.get_page(after=page.next_cursor)
+
+    def assertPagesBothWays(self, ordering, per_page=3):
+        paginator = KeysetPaginator(School.objects.all(), ordering, per_page)
+        expected = self.expected_ids(ordering)
+
+        ids, pages = self.walk_forward(paginator)
+        self.assertEqual(ids, expected)
+        self.assertEqual([page.offset for page in pages], list(range(0, len(expected), per_page)))
+        self.assertFalse(pages[0].has_previous())
+
+        # Back from the last page to the first
+        page = pages[-1]
+        backwards = []
+        while page.has_previous():
+            page = paginator.get_page(before=page.previous_cursor)
+            backwards = self.page_ids(page) + backwards
+        self.assertEqual(backwards, expected[:len(expected) - len(pages[-1])])
+        self.assertEqual(page.offset, 0)
+        self.assertTrue(page.has_next())
+
+    def test_ascending_with_nulls_in_the_sort_key(self):
+        self.assertPagesBothWays(['established_date', 'id'])
+
+    def test_descending_with_nulls_in_the_sort_key(self):
+        self.assertPagesBothWays(['-established_date', '-id'])
+
+    def test_mixed_directions(self):
+        self.assertPagesBothWays(['-established_date', 'name', '-id'])
+        self.assertPagesBothWays(['name', '-established_date', 'id'], per_page=4)
+
+    def test_keyset_filter_after_a_null(self):
+        keys = parse_ordering(['established_date', 'id'])
+        first = School.objects.filter(established_date__isnull=True).order_by('id').first()
+        after = School.objects.filter(keyset_filter(keys, [None, first.id])).order_by(*order_by_keys(keys))
+        self.assertEqual(list(after.values_list('id', flat=True)), self.expected_ids(['established_date', 'id'])[1:])
+
+    def test_invalid_cursors_fall_back_to_the_first_page(self):
+        paginator = KeysetPaginator(School.objects.all(), ['established_date', 'id'], 3)
+        first_page = self.page_ids(paginator.get_page())
+        for cursor in (
+            'garbage',
+            encode_cursor([1], 3),  # wrong number of keys
+            encode_cursor(['not a date', 1], 3),
+            encode_cursor([None, 'not an id'], 3),
+        ):
+            for direction in ('after', 'before'):
+                with self.subTest(cursor=cursor, direction=direction):
+                    page = paginator.get_page(**{direction: cursor})
+                    self.assertEqual(self.page_ids(page), first_page)
+                    self.assertEqual(page.offset, 0)
+                    self.assertFalse(page.has_previous())
+
+    def test_tampered_offset_only_shifts_the_numbering(self):
+        paginator = KeysetPaginator(School.objects.all(), ['established_date', 'id'], 3)
+        cursor = paginator.get_page().next_cursor
+        values, _ = decode_cursor(cursor)
+        tampered = base64.urlsafe_b64encode(json.dumps({'v': values, 'o': 1000}).encode()).decode()
+        page = paginator.get_page(after=tampered)
+        self.assertEqual(self.page_ids(page), self.page_ids(paginator.get_page(after=cursor)))
+        self.assertEqual(page.offset, 1000)
+
+    def test_totals(self):
+        self.assertEqual(KeysetPaginator(School.objects.all(), ['id'], 3, total='exact').get_page().total, 11)
+        self.assertEqual(KeysetPaginator(School.objects.all(), ['id'], 20, total='exact').get_page().total, 11)
+        self.assertIsNone(KeysetPaginator(School.objects.all(), ['id'], 3).get_page().total)
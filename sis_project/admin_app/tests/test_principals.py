@@ -0,0 +1,109 @@
+"""
+Login resolution across the admin, tutor and student tables.
+"""
+from unittest import mock
+
+from django.contrib.auth import hashers
+from django.test import TestCase
+
+from admin_app.models import AcademicGroup, Admin, Department, School, Student, Tutor
+from admin_app.principals import _dummy_password_hash, authenticate_principal
+
+# One username held by an account of every role
+USERNAME = 'AB1234567'
+
+
+class AuthenticatePrincipalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name='School', code='S1')
+        department = Department.objects.create(school=school, name='Department', code='D1')
+        group = AcademicGroup.objects.create(
+            school=school, department=department, group_name='G1',
+            study_year=1, semester=1, academic_year='2025-2026',
+        )
+        # The student's username and initial password are the ID card
+        cls.student = Student.objects.create(
+            academic_group=group, first_name='Aziz', last_name='Karimov', id_card=USERNAME,
+        )
+        cls.admin = Admin.objects.create(
+            first_name='Admin', last_name='User', username=USERNAME,
+            password='admin-pw', email='admin@example.com',
+        )
+        cls.tutor = Tutor.objects.create(
+            first_name='Tutor', last_name='User', username=USERNAME,
+            password='tutor-pw', email='tutor@example.com',
+        )
+
+    def setUp(self):
+        # Build the dummy hash up front so the mocks only see the checks of the attempt
+        _dummy_password_hash()
+
+    def authenticate(self, username, password):
+        """``authenticate_principal`` in one query, counting the password hashes checked"""
+        with mock.patch.object(hashers, 'check_password', wraps=hashers.check_password) as check_password, \
+                mock.patch.object(hashers, 'make_password', wraps=hashers.make_password) as make_password, \
+                self.assertNumQueries(1):
+            principal = authenticate_principal(username, password)
+        self.assertEqual(make_password.call_count, 0)
+        return principal, check_password.call_count
+
+    def assertPrincipal(self, principal, role, account):
+        self.assertIsNotNone(principal)
+        self.assertEqual((principal['role'], principal['id']), (role, account.id))
+
+    def test_admin_takes_precedence(self):
+        principal, hashes = self.authenticate(USERNAME, 'admin-pw')
+        self.assertPrincipal(principal, 'admin', self.admin)
+        self.assertEqual((principal['username'], principal['super_admin']), (USERNAME, False))
+        self.assertEqual(hashes, 0)
+
+    def test_admin_with_wrong_password_falls_through_to_tutor(self):
+        principal, hashes = self.authenticate(USERNAME, 'tutor-pw')
+        self.assertPrincipal(principal, 'tutor', self.tutor)
+        self.assertEqual(hashes, 0)
+
+    def test_tutor_with_wrong_password_ends_the_attempt(self):
+        # The student's own password does not get past a tutor of the same name
+        principal, hashes = self.authenticate(USERNAME, USERNAME)
+        self.assertIsNone(principal)
+        self.assertEqual(hashes, 1)
+
+    def test_student_without_tutor(self):
+        Tutor.objects.filter(pk=self.tutor.pk).update(username='someone-else')
+        principal, hashes = self.authenticate(USERNAME, USERNAME)
+        self.assertPrincipal(principal, 'student', self.student)
+        self.assertEqual(hashes, 1)
+
+    def test_student_wrong_password_checks_only_the_student_hash(self):
+        Tutor.objects.filter(pk=self.tutor.pk).update(username='someone-else')
+        principal, hashes = self.authenticate(USERNAME, 'wrong')
+        self.assertIsNone(principal)
+        self.assertEqual(hashes, 1)
+
+    def test_wrong_password(self):
+        principal, hashes = self.authenticate(USERNAME, 'wrong')
+        self.assertIsNone(principal)
+        self.assertEqual(hashes, 1)
+
+    def test_inactive_accounts_are_skipped(self):
+        Admin.objects.filter(pk=self.admin.pk).update(is_active=False)
+        principal, _ = self.authenticate(USERNAME, 'admin-pw')
+        self.assertIsNone(principal)
+
+        Tutor.objects.filter(pk=self.tutor.pk).update(is_active=False)
+        principal, _ = self.authenticate(USERNAME, USERNAME)
+        self.assertPrincipal(principal, 'student', self.student)
+
+    def test_unknown_user_checks_exactly_one_dummy_hash(self):
+        principal, hashes = self.authenticate('nobody', 'whatever')
+        self.assertIsNone(principal)
+        self.assertEqual(hashes, 1)
+
+    def test_dummy_hash_is_made_once(self):
+        _dummy_password_hash.cache_clear()
+        with mock.patch.object(hashers, 'make_password', wraps=hashers.make_password) as make_password:
+            authenticate_principal('nobody', 'whatever')
+            authenticate_principal('nobody-else', 'whatever')
+        self.assertEqual(make_password.call_count, 1)
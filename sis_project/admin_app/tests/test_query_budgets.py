@@ -0,0 +1,171 @@
+"""
+Per-view query budgets.
+
+Every named URL of the admin, tutor and student apps is requested against a
+seeded dataset with a cold cache, and must issue exactly the number of
+queries in its budget. A per-row query shows up as a failure instead of
+hiding in the noise; a view that got cheaper needs its budget lowered.
+"""
+import importlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from admin_app.models import Admin, School, Tutor, Student
+from admin_app.seeding import DatasetGenerator, SEED_PASSWORD
+
+
+# Scale of the seeded dataset. Every list is larger than its page size, so a
+# per-row query shows up as a budget overrun rather than hiding in the noise.
+FIXTURE_SCALE = {
+    'schools': 3,
+    'departments_per_school': 2,
+    'groups_per_department': 4,
+    'students_per_group': 20,
+    'tutors': 14,
+    'groups_per_tutor': 4,
+}
+
+# Urlconfs whose every named URL must have at least one budget
+CHECKED_URLCONFS = ('admin_app.urls', 'tutors_app.urls', 'students_app.urls')
+
+REPORT_FIELDS = {'apply_filter': '1', 'field_gender': 'on', 'field_birthday': 'on', 'field_is_from_large_family': 'on'}
+
+# (role, method, url name, url kwargs, request data, query budget)
+# URL kwargs and data values naming a fixture key (see ``setUpTestData``) are
+# replaced by its value. Budgets are exact counts for a cold cache and include
+# the session and principal lookups.
+QUERY_BUDGETS = (
+    # Admin app
+    (None, 'get', 'login', {}, {}, 0),
+    ('admin', 'post', 'login_submit', {}, {'username': 'admin_username', 'password': SEED_PASSWORD}, 6),
+    ('admin', 'get', 'dashboard', {}, {}, 2),
+    ('admin', 'get', 'settings', {}, {}, 2),
+    ('admin', 'get', 'schools_list', {}, {}, 2),
+    ('admin', 'get', 'add_school', {}, {}, 1),
+    ('admin', 'get', 'edit_school', {'school_id': 'school'}, {}, 3),
+    ('admin', 'get', 'delete_school', {'school_id': 'school'}, {}, 2),
+    ('admin', 'get', 'academic_groups_list', {}, {}, 5),
+    ('admin', 'get', 'add_academic_group', {}, {}, 2),
+    ('admin', 'get', 'edit_academic_group', {'group_id': 'group'}, {}, 6),
+    ('admin', 'get', 'delete_academic_group', {'group_id': 'group'}, {}, 2),
+    ('admin', 'get', 'tutors_list', {}, {}, 7),
+    ('admin', 'get', 'add_tutor', {}, {}, 2),
+    ('admin', 'get', 'edit_tutor', {'tutor_id': 'tutor'}, {}, 4),
+    ('admin', 'get', 'delete_tutor', {'tutor_id': 'tutor'}, {}, 2),
+    ('admin', 'get', 'diagnostics', {}, {}, 1),
+    ('admin', 'json', 'get_departments_by_school', {}, {'school_id': 'school'}, 1),
+    ('admin', 'get', 'logout', {}, {}, 2),
+
+    # Tutors app
+    ('tutor', 'get', 'tutors:dashboard', {}, {}, 3),
+    ('tutor', 'get', 'tutors:academic_groups', {}, {}, 3),
+    ('tutor', 'get', 'tutors:group_students', {'group_id': 'group'}, {}, 9),
+    ('tutor', 'get', 'tutors:reports', {}, {}, 7),
+    ('tutor', 'get', 'tutors:reports', {}, REPORT_FIELDS, 9),
+    ('tutor', 'get', 'tutors:reports_export', {'file_format': 'csv'}, REPORT_FIELDS, 4),
+    ('tutor', 'get', 'tutors:settings', {}, {}, 2),
+    ('tutor', 'get', 'tutors:add_student', {'group_id': 'group'}, {}, 6),
+    ('tutor', 'get', 'tutors:edit_student', {'student_id': 'student'}, {}, 7),
+    ('tutor', 'get', 'tutors:view_student', {'student_id': 'student'}, {}, 7),
+    ('tutor', 'get', 'tutors:delete_student', {'student_id': 'student'}, {}, 6),
+    ('tutor', 'get', 'tutors:student_autocomplete', {}, {'q': 'ka'}, 4),
+    ('tutor', 'get', 'tutors:logout', {}, {}, 2),
+
+    # Students app
+    ('student', 'get', 'students:dashboard', {}, {}, 2),
+    ('student', 'get', 'students:general', {}, {}, 2),
+    ('student', 'get', 'students:personal_data', {}, {}, 2),
+    ('student', 'get', 'students:contact_info', {}, {}, 2),
+    ('student', 'get', 'students:family_info', {}, {}, 2),
+    ('student', 'get', 'students:additional_info', {}, {}, 5),
+    ('student', 'get', 'students:change_password', {}, {}, 2),
+    ('student', 'get', 'students:code_of_conduct', {}, {}, 2),
+    ('student', 'post', 'students:agree_to_code', {}, {}, 2),
+    ('student', 'get', 'students:logout', {}, {}, 2),
+)
+
+
+def urlconf_names(module_path):
+    """Return the (namespaced) names of the URLs declared in ``module_path``"""
+    module = importlib.import_module(module_path)
+    namespace = getattr(module, 'app_name', None)
+    return {
+        f'{namespace}:{pattern.name}' if namespace else pattern.name
+        for pattern in module.urlpatterns
+        if pattern.name
+    }
+
+
+# The cache is cleared before every request; a local memory cache keeps that
+# from ever reaching a shared (Redis) backend.
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'query-budgets'}},
+    SESSION_CACHE_ALIAS='default',
+)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed = 0
+        DatasetGenerator(seed=seed).generate(**FIXTURE_SCALE)
+        admin = Admin.objects.get(username=f'seed-admin-{seed}-0')
+        # The first seeded tutor and a student in one of their groups
+        tutor = Tutor.objects.get(username=f'seed-tutor-{seed}-0')
+        group = tutor.assigned_groups.order_by('id').first()
+        student = Student.objects.filter(academic_group=group, is_active=True).order_by('id').first()
+        cls.fixture = {
+            'school': School.objects.order_by('id').values_list('id', flat=True).first(),
+            'group': group.id,
+            'tutor': tutor.id,
+            'student': student.id,
+            'admin_username': admin.username,
+            'tutor_username': tutor.username,
+            'student_username': student.username,
+        }
+        cls.sessions = {
+            role: cls.log_in(cls.fixture[f'{role}_username'])
+            for role in ('admin', 'tutor', 'student')
+        }
+
+    @staticmethod
+    def log_in(username):
+        client = Client()
+        response = client.post(reverse('login_submit'), {'username': username, 'password': SEED_PASSWORD})
+        assert response.status_code == 302, f"Could not log in as {username}"
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def test_every_url_has_a_budget(self):
+        covered = {name for _, _, name, _, _, _ in QUERY_BUDGETS}
+        missing = set().union(*(urlconf_names(urlconf) for urlconf in CHECKED_URLCONFS)) - covered
+        self.assertFalse(missing, f"No query budget for: {', '.join(sorted(missing))}")
+
+    def test_query_budgets(self):
+        for role, method, name, kwargs, data, budget in QUERY_BUDGETS:
+            url = reverse(name, kwargs={key: self.fixture.get(value, value) for key, value in kwargs.items()})
+            data = {key: self.fixture.get(value, value) for key, value in data.items()}
+            with self.subTest(url=name, params=sorted(data)):
+                self.assert_num_queries(budget, self.sessions.get(role), method, url, data)
+
+    def assert_num_queries(self, budget, session_key, method, url, data):
+        """Run one request in a rolled-back savepoint and count its queries"""
+        client = Client()
+        if session_key:
+            client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        cache.clear()
+
+        with transaction.atomic():
+            with self.assertNumQueries(budget):
+                if method == 'json':
+                    response = client.post(url, data, content_type='application/json')
+                else:
+                    response = getattr(client, method)(url, data)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            # Writes (logins, logouts, agreements) must not leak into later requests
+            transaction.set_rollback(True)
+
+        self.assertLess(response.status_code, 400, url)
@@ -0,0 +1,74 @@
+"""
+Ranked student name search and its use as the default report order.
+"""
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from admin_app.models import AcademicGroup, Department, School, Student
+from admin_app.search import SEARCH_RANK, is_ranked, search_students
+from tutors_app.reports import REPORT_ORDERING, get_report_ordering, get_report_page
+
+
+class SearchRankingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name='School', code='S1')
+        department = Department.objects.create(school=school, name='Department', code='D1')
+        cls.group = AcademicGroup.objects.create(
+            school=school, department=department, group_name='G1',
+            study_year=1, semester=1, academic_year='2025-2026',
+        )
+        # (last name, first name) and how each matches "karim"
+        names = [
+            ('Karim', 'Aziz'),       # exact last name
+            ('Karimov', 'Bobur'),    # prefix of the last name
+            ('Abdukarimov', 'Ali'),  # inside the last name
+            ('Aliyev', 'Karim'),     # exact first name
+            ('Tursunov', 'Olim'),    # no match
+        ]
+        cls.students = {
+            f'{first} {last}': Student.objects.create(
+                academic_group=cls.group, first_name=first, last_name=last, id_card=f'AA{number:07d}',
+            )
+            for number, (last, first) in enumerate(names)
+        }
+
+    def search(self, term):
+        return search_students(Student.objects.all(), term, rank=True)
+
+    def test_unranked_search_only_filters(self):
+        queryset = search_students(Student.objects.all(), 'karim')
+        self.assertFalse(is_ranked(queryset))
+        self.assertEqual(queryset.count(), 4)
+
+    def test_empty_term_is_not_ranked(self):
+        self.assertFalse(is_ranked(self.search('  ')))
+
+    def test_exact_then_prefix_then_substring(self):
+        ranked = [f'{student.first_name} {student.last_name}' for student in self.search('karim')]
+        # An exact last name beats an exact first name (field priority)
+        self.assertEqual(ranked, ['Aziz Karim', 'Karim Aliyev', 'Bobur Karimov', 'Ali Abdukarimov'])
+
+    def test_every_word_adds_to_the_rank(self):
+        ranked = list(self.search('karim aziz').values_list('first_name', SEARCH_RANK))
+        self.assertEqual(ranked[0][0], 'Aziz')
+        self.assertEqual(len(ranked), 1)
+
+    def test_ranked_report_ordering_unless_sorted(self):
+        self.assertEqual(get_report_ordering(ranked=True), [f'-{SEARCH_RANK}', *REPORT_ORDERING])
+        self.assertEqual(get_report_ordering(), list(REPORT_ORDERING))
+        # An explicit sort wins over the rank
+        self.assertEqual(get_report_ordering('full_name', ranked=True)[:2], ['last_name', 'first_name'])
+
+    def test_ranked_report_pages_through_every_match(self):
+        queryset = self.search('karim')
+        ordering = get_report_ordering(ranked=is_ranked(queryset))
+        factory = RequestFactory()
+        page = get_report_page(queryset, ['gender'], ordering, factory.get('/').GET, per_page=3)
+        self.assertEqual([row['full_name'] for row in page], ['Aziz Karim', 'Karim Aliyev', 'Bobur Karimov'])
+        page = get_report_page(
+            queryset, ['gender'], ordering, factory.get('/', {'after': page.next_cursor}).GET, per_page=3,
+        )
+        self.assertEqual([row['full_name'] for row in page], ['Ali Abdukarimov'])
+        self.assertFalse(page.has_next())
@@ -26,6 +26,9 @@ urlpatterns = [
     path('tutors/edit/<int:tutor_id>/', views.edit_tutor_view, name='edit_tutor'),
     path('tutors/delete/<int:tutor_id>/', views.delete_tutor_view, name='delete_tutor'),
     
+    # Query diagnostics (super admins)
+    path('diagnostics/', views.diagnostics_view, name='diagnostics'),
+    
     # AJAX URLs
     path('api/departments-by-school/', views.get_departments_by_school, name='get_departments_by_school'),
 ]
\ No newline at end of file
@@ -2,14 +2,29 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
+from django.conf import settings
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.db import transaction, models
-from django.core.paginator import Paginator
+from django.db.models.functions import Coalesce
 from .models import Admin, School, Department, AcademicGroup, Tutor
 from .forms import SchoolForm, DepartmentFormSet, AcademicGroupForm, TutorForm
+from .principals import authenticate_principal, record_login
+from .dashboard import get_dashboard_stats
+from .pagination import KeysetPaginator
+from .fragments import group_tables_version
+from .diagnostics import get_findings, clear_findings, summarize_findings
 import json
 
 
+# Dashboard each role lands on after a successful login
+LOGIN_REDIRECTS = {
+    'admin': 'dashboard',
+    'tutor': 'tutors:dashboard',
+    'student': 'students:dashboard',
+}
+
+
 def login_page(request):
     """Display the login page"""
     return render(request, 'login.html')
@@ -29,77 +44,36 @@ def login_view(request):
                 messages.error(request, 'Please fill in all fields.')
                 return render(request, 'login.html')
             
-            # First try admin login
-            try:
-                admin = Admin.objects.get(username=username, is_active=True)
-                
-                # Simple password check (in production, use hashed passwords)
-                if admin.password == password:
-                    # Store admin info in session
-                    request.session['admin_id'] = admin.id
-                    request.session['admin_username'] = admin.username
-                    request.session['admin_name'] = f"{admin.first_name} {admin.last_name}"
-                    request.session['is_super_admin'] = admin.is_super_admin
-                    request.session['user_type'] = 'admin'
-                    
-                    # Update last login
-                    admin.update_last_login()
-                    
-                    # Redirect to admin dashboard
-                    return redirect('dashboard')
-                else:
-                    # Try tutor login if admin password doesn't match
-                    tutor_login_attempted = True
-                    
-            except Admin.DoesNotExist:
-                # Admin not found, try tutor login
-                tutor_login_attempted = True
+            # Resolve admin, tutor and student accounts in one query
+            principal = authenticate_principal(username, password)
             
-            # Try tutor login if admin login failed
-            if 'tutor_login_attempted' in locals() or True:
-                try:
-                    tutor = Tutor.objects.get(username=username, is_active=True)
-                    
-                    # Simple password check (in production, use hashed passwords)
-                    if tutor.password == password:
-                        # Store tutor info in session
-                        request.session['tutor_id'] = tutor.id
-                        request.session['tutor_username'] = tutor.username
-                        request.session['tutor_name'] = f"{tutor.first_name} {tutor.last_name}"
-                        request.session['user_type'] = 'tutor'
-                        
-                        # Update last login
-                        tutor.update_last_login()
-                        
-                        # Redirect to tutor dashboard
-                        return redirect('tutors:dashboard')
-                    else:
-                        messages.error(request, 'Invalid username or password. Please try again.')
-                        
-                except Tutor.DoesNotExist:
-                    # Try student login if tutor login also failed
-                    try:
-                        from .models import Student
-                        student = Student.objects.get(username=username, is_active=True)
-                        
-                        # Check password using Django's built-in check
-                        if student.check_password(password):
-                            # Store student info in session
-                            request.session['student_id'] = student.id
-                            request.session['student_username'] = student.username
-                            request.session['student_name'] = f"{student.first_name} {student.last_name}"
-                            request.session['user_type'] = 'student'
-                            
-                            # Update last login
-                            student.update_last_login()
-                            
-                            # Redirect to student dashboard
-                            return redirect('students:dashboard')
-                        else:
-                            messages.error(request, 'Invalid username or password. Please try again.')
-                            
-                    except Student.DoesNotExist:
-                        messages.error(request, 'Invalid username or password. Please try again.')
+            if principal is None:
+                messages.error(request, 'Invalid username or password. Please try again.')
+                return render(request, 'login.html')
+            
+            role = principal['role']
+            
+            # Drop any other role's keys left by an earlier login in this
+            # session: views check their own role's ``<role>_id`` while
+            # ``request.principal`` follows ``user_type``, so both must agree
+            for other_role in LOGIN_REDIRECTS:
+                for key in ('id', 'username', 'name'):
+                    request.session.pop(f'{other_role}_{key}', None)
+            request.session.pop('is_super_admin', None)
+            
+            # Store principal info in session
+            request.session[f'{role}_id'] = principal['id']
+            request.session[f'{role}_username'] = principal['username']
+            request.session[f'{role}_name'] = f"{principal['first_name']} {principal['last_name']}"
+            if role == 'admin':
+                request.session['is_super_admin'] = principal['super_admin']
+            request.session['user_type'] = role
+            
+            # Update last login
+            record_login(principal)
+            
+            # Redirect to the role's dashboard
+            return redirect(LOGIN_REDIRECTS[role])
                 
         except Exception as e:
             messages.error(request, f'Database error: {str(e)}. Please check if the database and admin table exist.')
@@ -114,21 +88,18 @@ def dashboard_view(request):
         messages.error(request, 'Please log in to access the dashboard.')
         return redirect('login')
     
-    # Get statistics from database
-    total_students = sum(group.current_students for group in AcademicGroup.objects.all())
-    total_tutors = Tutor.objects.filter(is_active=True).count()
-    total_academic_groups = AcademicGroup.objects.count()
-    total_schools = School.objects.count()
+    # Get statistics (single aggregate query, cached between writes)
+    stats = get_dashboard_stats()
     
     # Get admin info from session
     context = {
         'admin_name': request.session.get('admin_name'),
         'admin_username': request.session.get('admin_username'),
         'is_super_admin': request.session.get('is_super_admin', False),
-        'total_students': total_students,
-        'total_tutors': total_tutors,
-        'total_academic_groups': total_academic_groups,
-        'total_schools': total_schools,
+        'total_students': stats['total_students'],
+        'total_tutors': stats['total_tutors'],
+        'total_academic_groups': stats['total_academic_groups'],
+        'total_schools': stats['total_schools'],
     }
     
     return render(request, 'dashboard.html', context)
@@ -150,9 +121,8 @@ def settings_view(request):
         return redirect('login')
     
     # Get current admin
-    try:
-        admin = Admin.objects.get(id=request.session['admin_id'])
-    except Admin.DoesNotExist:
+    admin = request.principal
+    if not isinstance(admin, Admin):
         messages.error(request, 'Admin not found. Please log in again.')
         return redirect('login')
     
@@ -219,7 +189,26 @@ def schools_list_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    schools = School.objects.all().order_by('-created_at')
+    # Department, group and student counts come from correlated subqueries
+    # in the same query (joins would multiply rows); students are summed
+    # from the maintained AcademicGroup.current_students counters.
+    departments_count = (
+        Department.objects.filter(school=models.OuterRef('pk'))
+        .order_by().values('school').annotate(total=models.Count('id')).values('total')
+    )
+    groups_count = (
+        AcademicGroup.objects.filter(school=models.OuterRef('pk'))
+        .order_by().values('school').annotate(total=models.Count('id')).values('total')
+    )
+    students_count = (
+        AcademicGroup.objects.filter(school=models.OuterRef('pk'))
+        .order_by().values('school').annotate(total=models.Sum('current_students')).values('total')
+    )
+    schools = School.objects.annotate(
+        departments_count=Coalesce(models.Subquery(departments_count), 0),
+        groups_count=Coalesce(models.Subquery(groups_count), 0),
+        students_count=Coalesce(models.Subquery(students_count), 0),
+    ).order_by('-created_at')
     
     context = {
         'admin_name': request.session.get('admin_name'),
@@ -372,13 +361,10 @@ def academic_groups_list_view(request):
     if semester_filter:
         academic_groups = academic_groups.filter(semester=semester_filter)
     
-    # Order by creation date (newest first)
-    academic_groups = academic_groups.order_by('-created_at')
-    
-    # Pagination
-    paginator = Paginator(academic_groups, 10)  # 10 groups per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination, newest first (10 groups per page). Evaluated only
+    # when the cached table fragment is missing.
+    paginator = KeysetPaginator(academic_groups, ['-created_at', '-id'], 10, total='approximate')
+    page_obj = SimpleLazyObject(lambda: paginator.paginate(request.GET))
     
     # Get filter options
     schools = School.objects.filter(is_active=True).order_by('name')
@@ -389,6 +375,7 @@ def academic_groups_list_view(request):
         'admin_username': request.session.get('admin_username'),
         'is_super_admin': request.session.get('is_super_admin', False),
         'page_obj': page_obj,
+        'group_tables_version': group_tables_version(),
         'search_query': search_query,
         'schools': schools,
         'departments': departments,
@@ -547,13 +534,9 @@ def tutors_list_view(request):
     if department_filter:
         tutors = tutors.filter(assigned_groups__department_id=department_filter).distinct()
     
-    # Order by creation date (newest first)
-    tutors = tutors.order_by('-created_at')
-    
-    # Pagination
-    paginator = Paginator(tutors, 10)  # 10 tutors per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination, newest first (10 tutors per page)
+    paginator = KeysetPaginator(tutors, ['-created_at', '-id'], 10, total='approximate')
+    page_obj = paginator.paginate(request.GET)
     
     # Get filter options
     schools = School.objects.filter(is_active=True).order_by('name')
@@ -610,7 +593,8 @@ def edit_tutor_view(request, tutor_id):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    tutor = get_object_or_404(Tutor, id=tutor_id)
+    # Prefetched so the template's "checked" test doesn't query per group
+    tutor = get_object_or_404(Tutor.objects.prefetch_related('assigned_groups'), id=tutor_id)
     
     if request.method == 'POST':
         form = TutorForm(request.POST, instance=tutor)
@@ -653,4 +637,36 @@ def delete_tutor_view(request, tutor_id):
         except Exception as e:
             messages.error(request, f'Error deleting tutor: {str(e)}')
     
-    return redirect('tutors_list')
\ No newline at end of file
+    return redirect('tutors_list')
+
+
+def diagnostics_view(request):
+    """Slow and duplicate queries recorded by QueryDiagnosticsMiddleware (super admins only)"""
+    if 'admin_id' not in request.session:
+        messages.error(request, 'Please log in to access this page.')
+        return redirect('login')
+    
+    if not request.session.get('is_super_admin', False):
+        messages.error(request, 'Only super admins can view diagnostics.')
+        return redirect('dashboard')
+    
+    if request.method == 'POST' and request.POST.get('action') == 'clear':
+        clear_findings()
+        messages.success(request, 'Recorded query findings have been cleared.')
+        return redirect('diagnostics')
+    
+    findings = get_findings()
+    context = {
+        'admin_name': request.session.get('admin_name'),
+        'admin_username': request.session.get('admin_username'),
+        'is_super_admin': True,
+        'diagnostics_enabled': getattr(settings, 'QUERY_DIAGNOSTICS', False),
+        'slow_query_ms': getattr(settings, 'SLOW_QUERY_MS', 100),
+        'duplicate_threshold': getattr(settings, 'DUPLICATE_QUERY_THRESHOLD', 5),
+        'summary': summarize_findings(findings),
+        'findings': findings[:50],
+        'slow_count': sum(finding['kind'] == 'slow' for finding in findings),
+        'duplicate_count': sum(finding['kind'] == 'duplicate' for finding in findings),
+    }
+    
+    return render(request, 'diagnostics.html', context)
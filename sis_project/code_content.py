@@ -3,9 +3,13 @@ Code of Ethical Conduct Content Management
 This file handles reading and managing the Code of Ethical Conduct content from Word documents (.docx)
 """
 
+import hashlib
 import os
-from docx import Document
+import time
+
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.html import escape
 
 # Document file paths (relative to project root)
 DOCUMENT_PATHS = {
@@ -83,21 +87,38 @@ To review the full content of the Code of Ethical Conduct, download the PDF file
     }
 }
 
+LANGUAGES = ('uzbek', 'russian', 'english')
+
+# Parsed content is kept per worker and shared through the cache. A worker
+# re-checks the documents' modification times at most this often (seconds),
+# so between checks the page does no disk I/O at all.
+MTIME_CHECK_INTERVAL = 60
+CACHE_TIMEOUT = 60 * 60 * 24
+
+_memo = {'signature': None, 'content': None, 'checked_at': None}
+
+
+def absolute_path(file_path):
+    """Resolve a document path relative to the project root"""
+    if not os.path.isabs(file_path):
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        file_path = os.path.join(base_dir, file_path)
+    return file_path
+
+
 def read_docx_content(file_path):
     """
     Extract text content from a Word document (.docx)
     Returns tuple: (title, content)
     """
     try:
-        # Get absolute path
-        if not os.path.isabs(file_path):
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            file_path = os.path.join(base_dir, file_path)
+        file_path = absolute_path(file_path)
         
         if not os.path.exists(file_path):
             return None, None
         
-        # Read document
+        # Read document (python-docx is only imported when a document exists)
+        from docx import Document
         doc = Document(file_path)
         
         # Extract title (usually first paragraph or first heading)
@@ -126,22 +147,27 @@ def read_docx_content(file_path):
         print(f"Error reading {file_path}: {e}")
         return None, None
 
-def get_code_content():
+def paragraphs_to_html(content):
+    """Render paragraphs separated by blank lines as escaped ``<p>`` elements"""
+    return ''.join(f'<p>{escape(paragraph)}</p>' for paragraph in content.split('\n\n'))
+
+
+def build_code_content():
     """
-    Returns the code of conduct content, prioritizing .docx files over fallback content.
+    Read the code of conduct content, prioritizing .docx files over fallback content.
     """
     content = {}
     
-    for lang in ['uzbek', 'russian', 'english']:
+    for lang in LANGUAGES:
         # Try to read from .docx file first
         doc_path = DOCUMENT_PATHS[lang]
         title, doc_content = read_docx_content(doc_path)
         
         if title and doc_content:
-            # Use content from .docx file
+            # Use content from .docx file, pre-rendered to HTML
             content[lang] = {
                 'title': title,
-                'content': doc_content,
+                'content': paragraphs_to_html(doc_content),
                 'source': 'document'
             }
         else:
@@ -154,6 +180,43 @@ def get_code_content():
     
     return content
 
+
+def documents_signature():
+    """The path and modification time (``None`` if missing) of each document"""
+    signature = []
+    for lang in LANGUAGES:
+        path = absolute_path(DOCUMENT_PATHS[lang])
+        try:
+            signature.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def get_code_content():
+    """
+    Returns the code of conduct content for every language.
+
+    Served from this worker's memory while the documents are unchanged; a
+    worker that has not parsed this version yet takes it from the cache, and
+    only the first one to see it parses the .docx files.
+    """
+    now = time.monotonic()
+    if _memo['content'] is not None and now - _memo['checked_at'] < MTIME_CHECK_INTERVAL:
+        return _memo['content']
+    
+    signature = documents_signature()
+    if signature != _memo['signature']:
+        key = 'code-of-conduct:' + hashlib.md5(repr(signature).encode()).hexdigest()
+        content = cache.get(key)
+        if content is None:
+            content = build_code_content()
+            cache.set(key, content, CACHE_TIMEOUT)
+        _memo['signature'] = signature
+        _memo['content'] = content
+    _memo['checked_at'] = now
+    return _memo['content']
+
 def update_document_files(uzbek_file=None, russian_file=None, english_file=None):
     """
     Helper function to update document file paths.
@@ -170,6 +233,8 @@ def update_document_files(uzbek_file=None, russian_file=None, english_file=None)
         DOCUMENT_PATHS['russian'] = russian_file  
     if english_file:
         DOCUMENT_PATHS['english'] = english_file
+    # Pick up the new paths on the next call
+    _memo['checked_at'] = None
 
 def test_document_reading():
     """
@@ -0,0 +1,71 @@
+"""
+Gunicorn settings for the production container.
+
+Workers are threaded (``gthread``): a slow report or export occupies one
+thread rather than a whole worker process, and the worker keeps answering
+gunicorn's heartbeat while it runs. Every value can be overridden with a
+``GUNICORN_*`` environment variable.
+"""
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def available_cpus():
+    """CPUs this process may run on (respects container cpusets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# One process per CPU plus one to cover a worker that is restarting; the
+# threads overlap database and cache waits. Each thread can hold its own
+# database connection, so workers * threads must stay below the connection
+# limit of PostgreSQL (or of its pooler).
+worker_class = 'gthread'
+workers = env_int('GUNICORN_WORKERS', available_cpus() + 1)
+threads = env_int('GUNICORN_THREADS', 4)
+
+# Recycle workers after a jittered number of requests so slow memory growth
+# is capped and the workers do not all restart at once
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# Import Django once in the master; workers fork with the code already loaded
+# and share its memory pages
+preload_app = True
+
+# With gthread the timeout bounds an unresponsive worker, not a request.
+# nginx gives up on a request after 60 s (proxy_read_timeout).
+timeout = env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall the heartbeat
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Refuse to start when the cache (Redis in production) is unreachable.
+    # Django is already loaded here because the app is preloaded.
+    from django.core.cache import caches
+    from django.core.management import call_command
+    call_command('check', tags=['caches'])
+    caches.close_all()
+
+
+def post_fork(server, worker):
+    # Connections opened by the master while preloading must not be shared
+    # between the forked workers
+    from django.db import connections
+    connections.close_all()
@@ -0,0 +1,17 @@
+"""
+Settings for the sis project.
+
+``DJANGO_ENV`` selects the environment: ``dev`` (the default) or ``prod``.
+Both build on ``base``.
+"""
+import os
+
+_environment = os.environ.get('DJANGO_ENV', 'dev')
+
+if _environment == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif _environment == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured(f"DJANGO_ENV must be 'dev' or 'prod', not {_environment!r}")
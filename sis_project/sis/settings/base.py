@@ -1,5 +1,8 @@
 """
-Django settings for sis project.
+Django settings for sis project shared by every environment.
+
+``sis.settings`` loads ``dev`` or ``prod`` on top of these according to the
+``DJANGO_ENV`` environment variable.
 
 Generated by 'django-admin startproject' using Django 4.2.
 
@@ -22,7 +25,7 @@ def _get_env_list(key: str, default: list[str]) -> list[str]:
     return default
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
@@ -67,12 +70,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its timings cover the rest of the stack; inactive
+    # unless REQUEST_PROFILING is on
+    'admin_app.middleware.RequestProfilingMiddleware',
+    'admin_app.middleware.QueryDiagnosticsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'admin_app.middleware.PrincipalMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -111,6 +119,15 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', '123456789'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        # Keep each worker thread's connection for this many seconds instead of
+        # opening one per request (0 closes it after every request)
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        # Ping a reused connection before the request uses it, so a database
+        # restart costs one reconnect instead of a failed request
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1',
+        # Required behind pgbouncer in transaction mode, where a cursor cannot
+        # outlive its transaction
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1',
     }
 }
 
@@ -164,7 +181,28 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Sessions are written through to the database and read from the cache, so
+# a cache flush or restart does not log everyone out
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # Login URLs
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/login/'
+
+# Request profiling (admin_app.middleware.RequestProfilingMiddleware)
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING', '0') == '1'
+# Share of requests run under a code profiler, kept when slower than the threshold
+REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get('REQUEST_PROFILING_SAMPLE_RATE', '0'))
+REQUEST_PROFILING_SLOW_MS = float(os.environ.get('REQUEST_PROFILING_SLOW_MS', '500'))
+REQUEST_PROFILING_PROFILER = os.environ.get('REQUEST_PROFILING_PROFILER', 'cprofile')  # or 'pyinstrument'
+REQUEST_PROFILING_DIR = os.environ.get('REQUEST_PROFILING_DIR', BASE_DIR / 'profiles')
+if REQUEST_PROFILING:
+    # Same engine, with templates that report their render time
+    TEMPLATES[0]['BACKEND'] = 'admin_app.profiling.ProfilingDjangoTemplates'
+
+# Slow-query log and duplicate-query detector (admin_app.middleware.QueryDiagnosticsMiddleware)
+QUERY_DIAGNOSTICS = os.environ.get('QUERY_DIAGNOSTICS', '0') == '1'
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+# Same statement more often than this in one request is reported as an N+1
+DUPLICATE_QUERY_THRESHOLD = int(os.environ.get('DUPLICATE_QUERY_THRESHOLD', '5'))
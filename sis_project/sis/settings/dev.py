@@ -0,0 +1,11 @@
+"""
+Development settings: a per-process memory cache and no external services
+besides the database.
+"""
+from .base import *  # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -1,13 +1,11 @@
 """
-Django Settings for Production Deployment
-Add these settings to your settings.py or create a new production.py file
+Production settings (``DJANGO_ENV=prod``), as used by the Docker deployment.
 """
-
 import os
 from pathlib import Path
 
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get('DEBUG', '0') == '1'
@@ -15,52 +13,54 @@ DEBUG = os.environ.get('DEBUG', '0') == '1'
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get('SECRET_KEY', 'your-default-secret-key-change-this')
 
-# Allowed hosts - configure for your domain
-ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+DATABASES['default']['HOST'] = os.environ.get('DB_HOST', 'db')  # noqa: F405
 
-# Database configuration for Docker
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.environ.get('POSTGRES_DB', 'sis'),
-        'USER': os.environ.get('POSTGRES_USER', 'postgres'),
-        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'sis_secure_password_2024'),
-        'HOST': os.environ.get('DB_HOST', 'db'),
-        'PORT': os.environ.get('DB_PORT', '5432'),
-        'OPTIONS': {
-            'charset': 'utf8',
-        },
-    }
-}
+# Compile each template once per worker instead of on every render
+TEMPLATES[0]['APP_DIRS'] = False  # noqa: F405
+TEMPLATES[0]['OPTIONS']['loaders'] = [  # noqa: F405
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
 
-# Redis Cache Configuration
+# Redis, with a short-lived copy of hot keys in each worker's memory.
+# admin_app.cache.TieredCache serves a key from the local level for at most
+# CACHE_LOCAL_TIMEOUT seconds, so other workers see a change within that time.
 CACHES = {
     'default': {
+        'BACKEND': 'admin_app.cache.TieredCache',
+        'OPTIONS': {
+            'LOCAL': 'local',
+            'SHARED': 'redis',
+            'LOCAL_TIMEOUT': int(os.environ.get('CACHE_LOCAL_TIMEOUT', '5')),
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sis-local',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    'redis': {
         'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': f"redis://{os.environ.get('REDIS_HOST', 'redis')}:6379/1",
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
             'PASSWORD': os.environ.get('REDIS_PASSWORD', 'redis_password_2024'),
         }
-    }
+    },
 }
 
-# Session configuration
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
-SESSION_CACHE_ALIAS = 'default'
+# Session configuration. Sessions skip the local level: a logout must take
+# effect in every worker at once.
+SESSION_CACHE_ALIAS = 'redis'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_COOKIE_SECURE = not DEBUG  # Use HTTPS in production
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = 'Lax'
 
-# Static files (CSS, JavaScript, Images)
-STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
-
-# Media files (uploads)
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
-
 # Security settings for production
 if not DEBUG:
     # Security headers
@@ -70,16 +70,19 @@ if not DEBUG:
     SECURE_HSTS_SECONDS = 31536000  # 1 year
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_PRELOAD = True
-    
+
     # SSL settings (enable if using HTTPS)
     # SECURE_SSL_REDIRECT = True
     # SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
-    
+
     # CSRF settings
     CSRF_COOKIE_SECURE = True
     CSRF_COOKIE_HTTPONLY = True
 
-# Logging configuration
+# Logging configuration. Files are opened on the first message, so an
+# unwritable log directory does not stop the server from starting.
+LOG_DIR = Path(os.environ.get('LOG_DIR', BASE_DIR / 'logs'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -92,21 +95,36 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'structured': {
+            # Profiling messages are already JSON; prefix them with a timestamp
+            'format': '{asctime} {message}',
+            'style': '{',
+        },
     },
     'handlers': {
         'file': {
             'level': 'INFO',
             'class': 'logging.handlers.RotatingFileHandler',
-            'filename': '/app/logs/django.log',
+            'filename': LOG_DIR / 'django.log',
             'maxBytes': 1024*1024*15,  # 15MB
             'backupCount': 10,
             'formatter': 'verbose',
+            'delay': True,
         },
         'console': {
             'level': 'INFO',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        'profiling_file': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': LOG_DIR / 'profiling.log',
+            'maxBytes': 1024*1024*15,  # 15MB
+            'backupCount': 5,
+            'formatter': 'structured',
+            'delay': True,
+        },
     },
     'loggers': {
         'django': {
@@ -114,14 +132,32 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
-        'admin_app': {  # Your app name
+        'admin_app': {
             'handlers': ['file', 'console'],
             'level': 'INFO',
             'propagate': True,
         },
+        'admin_app.diagnostics': {  # Slow and duplicate queries
+            'handlers': ['file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'admin_app.profiling': {  # Request timings, one JSON line per request
+            'handlers': ['profiling_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
+# Request profiling (admin_app.middleware.RequestProfilingMiddleware), off by default
+REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get('REQUEST_PROFILING_SAMPLE_RATE', '0.01'))
+REQUEST_PROFILING_SLOW_MS = float(os.environ.get('REQUEST_PROFILING_SLOW_MS', '1000'))
+REQUEST_PROFILING_DIR = os.environ.get('REQUEST_PROFILING_DIR', LOG_DIR / 'profiles')
+
+# Slow-query log and duplicate-query detector (admin_app.middleware.QueryDiagnosticsMiddleware)
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+
 # Email configuration (configure for your SMTP server)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
@@ -131,15 +167,8 @@ EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@yourdomain.com')
 
-# Internationalization
-LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Tashkent'  # Uzbekistan timezone
-USE_I18N = True
-USE_TZ = True
 
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
-
-# Default primary key field type
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -27,9 +27,8 @@ def student_dashboard_view(request):
         return redirect('login')
     
     # Get student
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -52,9 +51,8 @@ def student_general_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -73,9 +71,8 @@ def student_personal_data_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -104,9 +101,8 @@ def student_contact_info_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -135,9 +131,8 @@ def student_family_info_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -166,9 +161,8 @@ def student_additional_info_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -248,9 +242,8 @@ def student_change_password_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -336,9 +329,8 @@ def student_code_of_conduct_view(request):
         messages.error(request, 'Please log in to access this page.')
         return redirect('login')
     
-    try:
-        student = Student.objects.get(id=request.session['student_id'])
-    except Student.DoesNotExist:
+    student = request.principal
+    if not isinstance(student, Student):
         messages.error(request, 'Student not found. Please log in again.')
         return redirect('login')
     
@@ -364,9 +356,11 @@ def agree_to_code_of_conduct(request):
     if 'student_id' not in request.session:
         return JsonResponse({'success': False, 'error': 'Not logged in'})
     
+    student = request.principal
+    if not isinstance(student, Student):
+        return JsonResponse({'success': False, 'error': 'Student not found'})
+    
     try:
-        student = Student.objects.get(id=request.session['student_id'])
-        
         # Check if already agreed
         if student.agreed_to_code_of_conduct:
             return JsonResponse({
@@ -385,7 +379,5 @@ def agree_to_code_of_conduct(request):
             'agreement_date': student.code_agreement_date.strftime('%B %d, %Y at %I:%M %p')
         })
         
-    except Student.DoesNotExist:
-        return JsonResponse({'success': False, 'error': 'Student not found'})
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
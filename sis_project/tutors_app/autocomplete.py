@@ -0,0 +1,96 @@
+"""
+Search-as-you-type lookup of students in a tutor's groups
+
+Terms are matched by prefix against last name, first name, student ID and
+ID card. On PostgreSQL each of those has an ``UPPER(col) text_pattern_ops``
+index (migration 0017), which is what ``istartswith`` compiles to, so a
+lookup is a handful of index range scans capped at ``limit`` rows.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from admin_app.models import Student
+from admin_app.search import name_search_filter, student_search_version
+
+
+# Columns a search term is prefix-matched against
+AUTOCOMPLETE_FIELDS = ('last_name', 'first_name', 'student_id', 'id_card')
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
+AUTOCOMPLETE_MAX_TERM_LENGTH = 50
+
+# Terms this short match many students and are typed by everyone, so their
+# results are cached; longer terms are cheap and rarely repeated.
+CACHED_PREFIX_LENGTH = 2
+AUTOCOMPLETE_CACHE_TIMEOUT = 60 * 5
+
+
+def normalize_term(term):
+    """Collapse whitespace and cap the length of a raw search term"""
+    return ' '.join((term or '').split())[:AUTOCOMPLETE_MAX_TERM_LENGTH]
+
+
+def parse_limit(value):
+    """Clamp the requested result count to ``1..AUTOCOMPLETE_MAX_LIMIT``"""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return AUTOCOMPLETE_LIMIT
+    return min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
+
+
+def find_students(group_ids, term, limit):
+    """Return up to ``limit`` result dicts for ``term`` within ``group_ids``"""
+    rows = (
+        Student.objects
+        .filter(academic_group_id__in=group_ids, is_active=True)
+        .filter(name_search_filter(term, AUTOCOMPLETE_FIELDS, lookup='istartswith'))
+        .order_by('last_name', 'first_name', 'id')
+        .values_list(
+            'id', 'first_name', 'middle_name', 'last_name',
+            'student_id', 'id_card', 'academic_group__group_name',
+        )[:limit]
+    )
+    return [
+        {
+            'id': student_id,
+            'name': ' '.join(part for part in (first_name, middle_name, last_name) if part),
+            'group': group_name,
+            'student_id': code,
+            'id_card': id_card,
+            'url': reverse('tutors:view_student', args=[student_id]),
+        }
+        for student_id, first_name, middle_name, last_name, code, id_card, group_name in rows
+    ]
+
+
+def _cache_key(group_ids, term, limit):
+    # Tutors with the same groups share entries; the search version makes
+    # them stale as soon as a student or group is written.
+    groups_digest = hashlib.md5(','.join(map(str, sorted(group_ids))).encode()).hexdigest()
+    term_digest = hashlib.md5(term.casefold().encode()).hexdigest()
+    return f'autocomplete:{student_search_version()}:{groups_digest}:{limit}:{term_digest}'
+
+
+def autocomplete_students(group_ids, term, limit=AUTOCOMPLETE_LIMIT):
+    """
+    Look up students matching ``term`` in the given groups.
+
+    Short prefixes are answered from the cache when possible.
+    """
+    term = normalize_term(term)
+    if not term or not group_ids:
+        return []
+
+    if len(term) > CACHED_PREFIX_LENGTH:
+        return find_students(group_ids, term, limit)
+
+    key = _cache_key(group_ids, term, limit)
+    results = cache.get(key)
+    if results is None:
+        results = find_students(group_ids, term, limit)
+        cache.set(key, results, AUTOCOMPLETE_CACHE_TIMEOUT)
+    return results
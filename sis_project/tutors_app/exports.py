@@ -0,0 +1,90 @@
+"""
+Streaming CSV and Excel exports for tutor reports
+
+Rows are produced one student at a time from ``queryset.iterator()``, so
+memory stays flat no matter how many students a tutor's groups contain.
+openpyxl is imported by the Excel export itself, so workers that never
+produce a spreadsheet do not pay for loading it.
+"""
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+
+from .reports import FIELD_LABELS, iter_report_rows
+
+
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+
+
+def get_report_header(selected_fields):
+    """Column titles for an export of ``selected_fields``"""
+    return ['#', 'Full Name', 'Group'] + [FIELD_LABELS[field] for field in selected_fields]
+
+
+def iter_export_rows(queryset, selected_fields):
+    """Yield one list of cell values per student"""
+    rows = iter_report_rows(queryset, selected_fields, chunk_size=EXPORT_CHUNK_SIZE)
+    for number, row in enumerate(rows, start=1):
+        yield [number, row['full_name'], row['group_name'], *row['values']]
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(queryset, selected_fields, filename):
+    """Stream the report as CSV without building it in memory"""
+    writer = csv.writer(_Echo())
+
+    def stream():
+        # UTF-8 BOM so Excel detects the encoding of Uzbek/Russian names
+        yield '\ufeff'
+        yield writer.writerow(get_report_header(selected_fields))
+        for row in iter_export_rows(queryset, selected_fields):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(queryset, selected_fields, filename):
+    """Write the report with openpyxl's write-only mode and stream the file"""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Student Report')
+
+    header_font = Font(bold=True, color='FFFFFF')
+    header_fill = PatternFill(start_color='667EEA', end_color='667EEA', fill_type='solid')
+    header = []
+    for title in get_report_header(selected_fields):
+        cell = WriteOnlyCell(worksheet, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        header.append(cell)
+    worksheet.append(header)
+
+    # Write-only worksheets spool rows to disk as they are appended
+    for row in iter_export_rows(queryset, selected_fields):
+        worksheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
@@ -3,8 +3,8 @@ Advanced filtering forms for tutor reports
 """
 import django_filters
 from django import forms
-from django.db.models import Q
 from admin_app.models import Student, AcademicGroup, School, Department
+from admin_app.search import search_students
 
 
 class AdvancedStudentFilter(django_filters.FilterSet):
@@ -229,14 +229,8 @@ class AdvancedStudentFilter(django_filters.FilterSet):
             self.filters['department'].queryset = Department.objects.filter(id__in=department_ids)
     
     def filter_by_name(self, queryset, name, value):
-        """Filter by first name, last name, or middle name"""
-        if value:
-            return queryset.filter(
-                Q(first_name__icontains=value) |
-                Q(last_name__icontains=value) |
-                Q(middle_name__icontains=value)
-            )
-        return queryset
+        """Filter by first name, last name, or middle name, best match first"""
+        return search_students(queryset, value, rank=True)
 
 
 class QuickStudentFilter(django_filters.FilterSet):
@@ -276,11 +270,5 @@ class QuickStudentFilter(django_filters.FilterSet):
             self.filters['academic_group'].queryset = assigned_groups
     
     def filter_by_name(self, queryset, name, value):
-        """Filter by first name, last name, or middle name"""
-        if value:
-            return queryset.filter(
-                Q(first_name__icontains=value) |
-                Q(last_name__icontains=value) |
-                Q(middle_name__icontains=value)
-            )
-        return queryset
\ No newline at end of file
+        """Filter by first name, last name, or middle name, best match first"""
+        return search_students(queryset, value, rank=True)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from admin_app.management.commands.benchmark_db_connections import percentile
+from admin_app.models import AcademicGroup, Student, Tutor
+from admin_app.principals import tutor_group_ids
+from tutors_app.autocomplete import (
+    AUTOCOMPLETE_FIELDS, AUTOCOMPLETE_LIMIT, CACHED_PREFIX_LENGTH,
+    autocomplete_students, find_students,
+)
+
+
+# Latency the autocomplete endpoint has to stay under, in milliseconds
+AUTOCOMPLETE_BUDGET_MS = 20
+
+
+class Command(BaseCommand):
+    """Measure autocomplete lookups against the data in the database."""
+
+    help = (
+        "Times student autocomplete lookups in one tutor's groups, with "
+        "uncached queries and cached short prefixes, and fails if a p95 is "
+        "over the budget. Seed the data first, e.g. 'seed_sis --scale 50' "
+        "for 50,000 students."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tutor', default='seed-tutor-0-0', help='Username of the tutor whose groups are searched')
+        parser.add_argument(
+            '--groups', type=int,
+            help="Search this many groups instead of the tutor's, to try a tutor with a larger load",
+        )
+        parser.add_argument('--terms', type=int, default=500, help='Search terms per lookup kind (default: 500)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for picking the terms')
+        parser.add_argument(
+            '--budget-ms', type=float, default=AUTOCOMPLETE_BUDGET_MS,
+            help=f'Maximum p95 in milliseconds (default: {AUTOCOMPLETE_BUDGET_MS})',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tutor = Tutor.objects.get(username=options['tutor'])
+        except Tutor.DoesNotExist:
+            raise CommandError(f"No tutor named {options['tutor']!r}; seed data with 'manage.py seed_sis' first")
+
+        if options['groups']:
+            scope = f"first {options['groups']} groups"
+            group_ids = frozenset(
+                AcademicGroup.objects.order_by('id').values_list('id', flat=True)[:options['groups']]
+            )
+        else:
+            scope = f"groups of {tutor.username}"
+            group_ids = tutor_group_ids(tutor.id)
+
+        terms = self.pick_terms(group_ids, options['terms'], random.Random(options['seed']))
+        short_terms = [term for term in terms if len(term) <= CACHED_PREFIX_LENGTH]
+        self.stdout.write(
+            f"{Student.objects.filter(is_active=True).count():,} active students on {connection.vendor}; "
+            f"searching the {scope} with limit {AUTOCOMPLETE_LIMIT}:"
+        )
+        self.stdout.write(f"  {'lookup':<34} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+
+        failures = []
+        runs = (
+            # (lookup, search, timed terms, untimed warm-up terms)
+            ('uncached query', lambda term: find_students(group_ids, term, AUTOCOMPLETE_LIMIT), terms, terms[:1]),
+            ('cached short prefix', lambda term: autocomplete_students(group_ids, term), short_terms, short_terms),
+        )
+        for lookup, search, run_terms, warm_up_terms in runs:
+            if not run_terms:
+                continue
+            lookup = f'{lookup} ({len(run_terms)} terms)'
+            # Open the connection, and fill the cache so every timed cached
+            # call is a hit
+            for term in warm_up_terms:
+                search(term)
+            timings = self.time_lookups(search, run_terms)
+            p50, p95, p99 = (percentile(timings, fraction) * 1000 for fraction in (0.5, 0.95, 0.99))
+            self.stdout.write(f"  {lookup:<34} {p50:8.2f} {p95:8.2f} {p99:8.2f} {max(timings) * 1000:8.2f} ms")
+            if p95 > options['budget_ms']:
+                failures.append(f"{lookup}: p95 {p95:.1f} ms over {options['budget_ms']:.0f} ms")
+
+        if failures:
+            for failure in failures:
+                self.stdout.write(self.style.ERROR(f"FAIL  {failure}"))
+            raise CommandError(f"{len(failures)} autocomplete lookup(s) over budget")
+        self.stdout.write(self.style.SUCCESS(f"Every p95 is within {options['budget_ms']:.0f} ms"))
+
+    @staticmethod
+    def pick_terms(group_ids, count, rng):
+        """Prefixes of names, student IDs and ID cards of students in the scope, as a tutor would type them"""
+        students = list(
+            Student.objects.filter(academic_group_id__in=group_ids, is_active=True)
+            .order_by('id')
+            .values_list(*AUTOCOMPLETE_FIELDS)
+        )
+        if not students:
+            raise CommandError('No active students in the searched groups')
+        terms = []
+        for _ in range(count):
+            last_name, first_name, student_id, id_card = rng.choice(students)
+            kind = rng.random()
+            if kind < 0.6:
+                value = rng.choice((last_name, first_name))
+                terms.append(value[:rng.randint(1, len(value))])
+            elif kind < 0.8:
+                # "Karimov Az" narrows a surname by the first name
+                terms.append(f"{last_name} {first_name[:rng.randint(1, len(first_name))]}")
+            else:
+                value = rng.choice((student_id, id_card))
+                terms.append(value[:rng.randint(2, len(value))])
+        return terms
+
+    @staticmethod
+    def time_lookups(search, terms):
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            search(term)
+            timings.append(time.perf_counter() - started)
+        return timings
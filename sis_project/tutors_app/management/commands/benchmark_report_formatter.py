@@ -0,0 +1,127 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tutors_app.reports import (
+    FIELD_LABELS, RELATED_FIELD_LOOKUPS, get_field_kind, get_model_field,
+    get_report_columns, format_full_name, format_report_rows,
+)
+
+
+def legacy_format_value(field, field_value, choices):
+    """The per-(row, field) if/elif ladder the formatter table replaced"""
+    if field in ('birthday', 'code_agreement_date'):
+        value = field_value.strftime('%d/%m/%Y') if field_value else 'Not provided'
+    elif field.startswith('is_') or field.startswith('are_') or field.startswith('has_') or field == 'agreed_to_code_of_conduct':
+        value = 'Yes' if field_value else 'No'
+    elif field in choices:
+        value = str(choices[field].get(field_value, field_value)) if field_value else 'Not provided'
+    else:
+        if field_value is None or field_value == '':
+            value = 'Not provided'
+        else:
+            value = str(field_value)
+    return value
+
+
+class Command(BaseCommand):
+    """Benchmark the report formatter on synthetic rows (no database needed)."""
+
+    help = "Times the legacy if/elif report formatter against the per-field formatter table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Number of synthetic student rows (default: 10000).")
+        parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing repetitions (default: 3).")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic rows.")
+
+    def handle(self, *args, **options):
+        fields = list(FIELD_LABELS)
+        columns = get_report_columns(fields)
+        positions = [columns.index(RELATED_FIELD_LOOKUPS.get(field, field)) for field in fields]
+        rows = self.make_rows(columns, options["rows"], random.Random(options["seed"]))
+        choices = {
+            field: {key: str(label) for key, label in get_model_field(field).flatchoices}
+            for field in fields
+            if get_field_kind(get_model_field(field)) == "choice"
+        }
+
+        def legacy():
+            formatted = []
+            for values in rows:
+                student_data = {
+                    "id": values[0],
+                    "full_name": format_full_name(values[1], values[2], values[3]),
+                    "group_name": values[4],
+                }
+                for field, position in zip(fields, positions):
+                    student_data[field] = legacy_format_value(field, values[position], choices)
+                formatted.append(student_data)
+            return formatted
+
+        def table():
+            return list(format_report_rows(rows, fields, positions))
+
+        # Warm up imports and check all paths agree before timing
+        expected = [
+            {
+                "id": row["id"],
+                "full_name": row["full_name"],
+                "group_name": row["group_name"],
+                "values": [row[field] for field in fields],
+            }
+            for row in legacy()
+        ]
+        if table() != expected:
+            self.stderr.write(self.style.ERROR("formatter table output differs from the legacy formatter"))
+            return
+
+        self.stdout.write(f"Formatting {len(rows)} rows x {len(fields)} fields (best of {options['repeat']}):")
+        baseline = None
+        for name, runner in (("legacy if/elif", legacy), ("formatter table", table)):
+            best = min(self.time(runner) for _ in range(options["repeat"]))
+            baseline = baseline or best
+            self.stdout.write(f"  {name:<20} {best * 1000:9.1f} ms   {baseline / best:5.2f}x")
+
+    @staticmethod
+    def time(runner):
+        start = time.perf_counter()
+        runner()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def make_rows(columns, count, rng):
+        """Build ``values_list``-shaped tuples with realistic value mixes"""
+        now = timezone.now()
+        generators = []
+        for column in columns:
+            if column == "id":
+                generators.append(lambda: rng.randint(1, 10 ** 6))
+                continue
+            if column == "middle_name":
+                generators.append(lambda: rng.choice([None, "", "Bahodirovich", "Karimovna"]))
+                continue
+            if column in ("first_name", "last_name", "academic_group__group_name"):
+                generators.append(lambda: rng.choice(["Aziz", "Dilnoza", "Rustam", "AI-01-25", "Sergey"]))
+                continue
+
+            field = next((name for name, lookup in RELATED_FIELD_LOOKUPS.items() if lookup == column), column)
+            model_field = get_model_field(field)
+            kind = get_field_kind(model_field)
+            if kind == "bool":
+                generators.append(lambda: rng.random() < 0.2)
+            elif kind == "date" and model_field.get_internal_type() == "DateTimeField":
+                generators.append(lambda: None if rng.random() < 0.3 else now - datetime.timedelta(minutes=rng.randint(0, 10 ** 6)))
+            elif kind == "date":
+                generators.append(lambda: None if rng.random() < 0.1 else datetime.date(1998, 1, 1) + datetime.timedelta(days=rng.randint(0, 3000)))
+            elif kind == "choice":
+                keys = [key for key, _ in model_field.flatchoices]
+                generators.append(lambda keys=keys: rng.choice(keys + [None]))
+            elif kind == "number":
+                generators.append(lambda: rng.randint(0, 6))
+            else:
+                generators.append(lambda: rng.choice([None, "", "+998 90 123 45 67", "Samarkand"]))
+
+        return [tuple(generate() for generate in generators) for _ in range(count)]
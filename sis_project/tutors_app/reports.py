@@ -0,0 +1,356 @@
+"""
+Student report definitions shared by the tutor reports page and exports
+"""
+
+from admin_app.models import AcademicGroup, Student
+from admin_app.pagination import KeysetPaginator, build_query, order_by_keys, parse_ordering
+from admin_app.search import SEARCH_RANK
+from .filters import AdvancedStudentFilter
+
+
+# All available fields organized by categories
+FIELD_CATEGORIES = {
+    'Academic Information': {
+        'group_name': 'Group Name',
+        'department': 'Department',
+        'study_year': 'Study Year',
+    },
+    'Personal Information': {
+        'birthday': 'Date of Birth',
+        'gender': 'Gender',
+        'nation': 'Nationality',
+        'id_card': 'ID Card',
+        'home_address': 'Home Address',
+        'phone_number': 'Phone Number',
+        'email': 'Email',
+        'telegram_username': 'Telegram Username',
+        'marital_status': 'Marital Status',
+    },
+    'Family Status': {
+        'is_from_large_family': 'From Large Family',
+        'is_from_low_income_family': 'From Low Income Family',
+        'is_from_troubled_family': 'From Troubled Family',
+        'are_parents_deceased': 'Parents Deceased',
+        'are_parents_divorced': 'Parents Divorced',
+        'is_father_deceased': 'Father Deceased',
+        'is_mother_deceased': 'Mother Deceased',
+        'has_disability': 'Has Disability',
+    },
+    'Father Information': {
+        'father_first_name': "Father's First Name",
+        'father_last_name': "Father's Last Name",
+        'father_middle_name': "Father's Middle Name",
+        'father_phone_number': "Father's Phone Number",
+        'father_telegram_username': "Father's Telegram Username",
+        'is_father_retired': 'Father Retired',
+        'is_father_disabled': 'Father Disabled',
+    },
+    'Mother Information': {
+        'mother_first_name': "Mother's First Name",
+        'mother_last_name': "Mother's Last Name",
+        'mother_middle_name': "Mother's Middle Name",
+        'mother_phone_number': "Mother's Phone Number",
+        'mother_telegram_username': "Mother's Telegram Username",
+        'is_mother_retired': 'Mother Retired',
+        'is_mother_disabled': 'Mother Disabled',
+    },
+    'Additional Family Information': {
+        'siblings_count': 'Number of Siblings',
+        'children_count': 'Number of Children',
+    },
+    'Personal Interests': {
+        'hobbies': 'Hobbies and Interests',
+        'special_skills': 'Special Skills and Talents',
+        'languages_spoken': 'Languages Spoken',
+    },
+    'System/Agreement Fields': {
+        'agreed_to_code_of_conduct': 'Agreed to Code of Conduct',
+        'code_agreement_date': 'Date of Agreement',
+    }
+}
+
+
+# Flat field -> label map, in display order
+FIELD_LABELS = {
+    field_name: field_label
+    for fields in FIELD_CATEGORIES.values()
+    for field_name, field_label in fields.items()
+}
+
+
+def get_selected_fields(params):
+    """Return the report fields ticked in the request parameters, in display order"""
+    return [field_name for field_name in FIELD_LABELS if params.get(f'field_{field_name}')]
+
+
+def get_selected_group(assigned_groups, group_param):
+    """Resolve the ``group`` request parameter to one of the tutor's groups"""
+    if not group_param or group_param == 'all':
+        return None
+    try:
+        return assigned_groups.get(id=int(group_param))
+    except (ValueError, AcademicGroup.DoesNotExist):
+        return None
+
+
+# ORM lookups for fields that live on related tables; every other report
+# field is a column of the students table with the same name.
+RELATED_FIELD_LOOKUPS = {
+    'group_name': 'academic_group__group_name',
+    'department': 'academic_group__department__name',
+    'study_year': 'academic_group__study_year',
+}
+
+# Columns every report row needs for the name, group and link cells
+BASE_COLUMNS = ('id', 'first_name', 'middle_name', 'last_name', 'academic_group__group_name')
+
+# Students shown on one page of the report results
+REPORT_PAGE_SIZE = 50
+
+# Default row order; ``id`` keeps the keyset unique
+REPORT_ORDERING = ('academic_group__group_name', 'last_name', 'first_name', 'id')
+
+# Sortable columns that are not report fields
+NAME_SORT = 'full_name'
+NAME_ORDERING = ('last_name', 'first_name')
+
+
+def get_report_queryset(assigned_groups, selected_group=None):
+    """Active students of the selected group, or of all the tutor's groups"""
+    if selected_group:
+        return Student.objects.filter(
+            academic_group=selected_group,
+            is_active=True
+        ).order_by(*REPORT_ORDERING)
+
+    return Student.objects.filter(
+        academic_group__in=assigned_groups,
+        is_active=True
+    ).order_by(*REPORT_ORDERING)
+
+
+# Filters the reports page covers by other means: the group selector and
+# the active-only base queryset.
+REPORT_EXCLUDED_FILTERS = ('academic_group', 'is_active')
+
+
+def get_report_filter(params, queryset, assigned_groups):
+    """
+    Bind ``AdvancedStudentFilter`` to the report parameters.
+
+    The filter's ``qs`` narrows ``queryset`` in SQL, so the paginated page,
+    the total count and the exports all see the same rows.
+    """
+    student_filter = AdvancedStudentFilter(params, queryset=queryset, assigned_groups=assigned_groups)
+    for name in REPORT_EXCLUDED_FILTERS:
+        student_filter.filters.pop(name, None)
+    return student_filter
+
+
+def get_report_sort(params, selected_fields):
+    """
+    Return ``(sort, descending)`` from the ``sort`` and ``direction`` parameters.
+
+    Only the name column and the selected fields can be sorted on; anything
+    else falls back to the default order (``sort`` is ``None``).
+    """
+    sort = params.get('sort')
+    if sort != NAME_SORT and sort not in selected_fields:
+        return None, False
+    return sort, params.get('direction') == 'desc'
+
+
+def get_report_ordering(sort=None, descending=False, ranked=False):
+    """
+    Ordering for a report sorted by ``sort``.
+
+    The sorted column goes first in the requested direction; the default
+    order follows (ascending) as the tie-breaker. Without a sort column, a
+    report ``ranked`` by a name search lists the best matches first.
+    """
+    if sort is None:
+        if ranked:
+            return [f'-{SEARCH_RANK}', *REPORT_ORDERING]
+        return list(REPORT_ORDERING)
+    if sort == NAME_SORT:
+        primary = NAME_ORDERING
+    else:
+        primary = (RELATED_FIELD_LOOKUPS.get(sort, sort),)
+    prefix = '-' if descending else ''
+    ordering = [f'{prefix}{lookup}' for lookup in primary]
+    return ordering + [lookup for lookup in REPORT_ORDERING if lookup not in primary]
+
+
+def get_report_headers(params, selected_fields, sort, descending):
+    """Sortable column headers with the query string that toggles each one"""
+    columns = [(NAME_SORT, 'Full Name')] + [(field, FIELD_LABELS[field]) for field in selected_fields]
+    headers = []
+    for field, label in columns:
+        active = field == sort
+        headers.append({
+            'field': field,
+            'label': label,
+            'active': active,
+            'descending': active and descending,
+            # Clicking the sorted column flips its direction
+            'query': build_query(params, sort=field, direction='desc' if active and not descending else 'asc'),
+        })
+    return headers
+
+
+def sort_report_queryset(queryset, ordering):
+    """Apply ``ordering`` with the same NULL placement as the paginated page"""
+    return queryset.order_by(*order_by_keys(parse_ordering(ordering)))
+
+
+def get_report_columns(selected_fields):
+    """
+    Plan the column projection for a report.
+
+    Only the selected columns are read, and the departments table is joined
+    only when ``department`` is requested.
+    """
+    columns = list(BASE_COLUMNS)
+    for field in selected_fields:
+        lookup = RELATED_FIELD_LOOKUPS.get(field, field)
+        if lookup not in columns:
+            columns.append(lookup)
+    return columns
+
+
+def format_full_name(first_name, middle_name, last_name):
+    """Same format as ``Student.get_full_name``"""
+    if middle_name:
+        return f"{first_name} {middle_name} {last_name}"
+    return f"{first_name} {last_name}"
+
+
+NOT_PROVIDED = 'Not provided'
+
+
+def _format_bool(value):
+    return 'Yes' if value else 'No'
+
+
+def _format_date(value):
+    return value.strftime('%d/%m/%Y') if value else NOT_PROVIDED
+
+
+def _format_text(value):
+    if value is None or value == '':
+        return NOT_PROVIDED
+    return str(value)
+
+
+def _choice_formatter(choices):
+    def format_choice(value):
+        return str(choices.get(value, value)) if value else NOT_PROVIDED
+    return format_choice
+
+
+def get_model_field(field):
+    """Return the model field a report field is read from"""
+    lookup = RELATED_FIELD_LOOKUPS.get(field, field)
+    model = Student
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def get_field_kind(model_field):
+    """Classify a model field as 'bool', 'date', 'choice', 'number' or 'text'"""
+    internal_type = model_field.get_internal_type()
+    if internal_type == 'BooleanField':
+        return 'bool'
+    if internal_type in ('DateField', 'DateTimeField'):
+        return 'date'
+    if model_field.choices:
+        return 'choice'
+    if internal_type in ('IntegerField', 'PositiveIntegerField'):
+        return 'number'
+    return 'text'
+
+
+def _build_formatters():
+    """Precompile one formatter per report field from the model metadata"""
+    formatters = {}
+    for field in FIELD_LABELS:
+        model_field = get_model_field(field)
+        kind = get_field_kind(model_field)
+        if kind == 'bool':
+            formatters[field] = _format_bool
+        elif kind == 'date':
+            formatters[field] = _format_date
+        elif kind == 'choice':
+            formatters[field] = _choice_formatter({key: str(label) for key, label in model_field.flatchoices})
+        else:
+            formatters[field] = _format_text
+    return formatters
+
+
+# field -> formatter; built once at import
+REPORT_FORMATTERS = _build_formatters()
+
+
+def format_report_rows(rows, selected_fields, positions):
+    """
+    Lazily format ``values_list`` tuples with the per-field formatter table.
+
+    Each row becomes ``{'id', 'full_name', 'group_name', 'values'}`` where
+    ``values`` holds the formatted cells in ``selected_fields`` order.
+    """
+    formatters = [(position, REPORT_FORMATTERS[field]) for field, position in zip(selected_fields, positions)]
+    return (
+        {
+            'id': values[0],
+            'full_name': format_full_name(values[1], values[2], values[3]),
+            'group_name': values[4],
+            'values': [formatter(values[position]) for position, formatter in formatters],
+        }
+        for values in rows
+    )
+
+
+def iter_report_rows(queryset, selected_fields, chunk_size=None):
+    """
+    Yield the display dict of each student in ``queryset``.
+
+    Rows are read as tuples through ``values_list()`` with the planned
+    projection, so no model instances are built. Pass ``chunk_size`` to
+    stream through a server-side cursor instead of loading all rows.
+    """
+    columns = get_report_columns(selected_fields)
+    positions = [columns.index(RELATED_FIELD_LOOKUPS.get(field, field)) for field in selected_fields]
+
+    rows = queryset.values_list(*columns)
+    if chunk_size:
+        rows = rows.iterator(chunk_size=chunk_size)
+    return format_report_rows(rows, selected_fields, positions)
+
+
+def get_report_page(queryset, selected_fields, ordering, params, per_page=REPORT_PAGE_SIZE):
+    """
+    Fetch and format the page of the report addressed by ``params``.
+
+    Pages are keyset-paginated on ``ordering``, so only ``per_page`` rows are
+    read and formatted however large the tutor's groups are. Returns the
+    ``KeysetPage``, whose ``object_list`` holds the display dicts.
+    """
+    columns = get_report_columns(selected_fields)
+    positions = [columns.index(RELATED_FIELD_LOOKUPS.get(field, field)) for field in selected_fields]
+    # The cursor needs every ordering value, including a search rank
+    keys = parse_ordering(ordering)
+    columns += [lookup for lookup, _ in keys if lookup not in columns]
+    key_positions = [columns.index(lookup) for lookup, _ in keys]
+
+    paginator = KeysetPaginator(
+        queryset.values_list(*columns),
+        ordering,
+        per_page,
+        key=lambda row: [row[position] for position in key_positions],
+        total='exact',
+    )
+    page = paginator.paginate(params)
+    page.object_list = list(format_report_rows(page.object_list, selected_fields, positions))
+    return page
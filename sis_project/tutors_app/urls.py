@@ -9,6 +9,7 @@ urlpatterns = [
     path('academic-groups/', views.tutor_academic_groups_view, name='academic_groups'),
     path('groups/<int:group_id>/students/', views.tutor_group_students_view, name='group_students'),
     path('reports/', views.tutor_reports_view, name='reports'),
+    path('reports/export/<str:file_format>/', views.tutor_reports_export_view, name='reports_export'),
     path('settings/', views.tutor_settings_view, name='settings'),
     path('logout/', views.tutor_logout_view, name='logout'),
     
@@ -17,4 +18,5 @@ urlpatterns = [
     path('students/<int:student_id>/edit/', views.tutor_edit_student_view, name='edit_student'),
     path('students/<int:student_id>/', views.tutor_view_student_view, name='view_student'),
     path('students/<int:student_id>/delete/', views.tutor_delete_student_view, name='delete_student'),
+    path('students/autocomplete/', views.tutor_student_autocomplete_view, name='student_autocomplete'),
 ]
\ No newline at end of file
@@ -3,16 +3,22 @@ from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse, HttpResponse
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.db import transaction
-from django.core.paginator import Paginator
 from admin_app.models import Tutor, AcademicGroup, Student
+from admin_app.fragments import group_tables_version
+from admin_app.pagination import KeysetPaginator
+from admin_app.principals import tutor_group_ids
+from admin_app.search import is_ranked
 from .forms import TutorProfileForm, TutorPasswordChangeForm, StudentForm
-from .filters import AdvancedStudentFilter, QuickStudentFilter
+from .reports import (
+    FIELD_CATEGORIES, get_selected_fields, get_selected_group, get_report_queryset,
+    get_report_filter, get_report_sort, get_report_ordering, get_report_headers,
+    get_report_page, sort_report_queryset,
+)
+from .exports import EXPORT_FORMATS, csv_response, xlsx_response
+from .autocomplete import autocomplete_students, parse_limit
 import json
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-import pandas as pd
 from datetime import datetime
 
 
@@ -24,15 +30,15 @@ def tutor_dashboard_view(request):
         return redirect('login')
     
     # Get tutor
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
     # Get statistics
-    assigned_groups = tutor.assigned_groups.filter(is_active=True)
-    total_groups = assigned_groups.count()
+    # One query for the groups; the template shows their school and department
+    assigned_groups = list(tutor.assigned_groups.filter(is_active=True).select_related('school', 'department'))
+    total_groups = len(assigned_groups)
     total_students = sum(group.current_students for group in assigned_groups)
     
     # Calculate group statistics
@@ -64,19 +70,17 @@ def tutor_academic_groups_view(request):
         return redirect('login')
     
     # Get tutor
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
     # Get assigned groups
     assigned_groups = tutor.assigned_groups.select_related('school', 'department').filter(is_active=True)
     
-    # Apply pagination
-    paginator = Paginator(assigned_groups, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Apply keyset pagination, evaluated only when the cached table fragment is missing
+    paginator = KeysetPaginator(assigned_groups, ['group_name', 'id'], 10, total='exact')
+    page_obj = SimpleLazyObject(lambda: paginator.paginate(request.GET))
     
     context = {
         'tutor_name': request.session.get('tutor_name'),
@@ -84,6 +88,7 @@ def tutor_academic_groups_view(request):
         'tutor': tutor,
         'page_obj': page_obj,
         'assigned_groups': page_obj,
+        'group_tables_version': group_tables_version(),
     }
     
     return render(request, 'tutors/academic_groups.html', context)
@@ -97,19 +102,18 @@ def tutor_group_students_view(request, group_id):
         return redirect('login')
     
     # Get tutor and group
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-        group = get_object_or_404(AcademicGroup, id=group_id)
-        
-        # Check if tutor has access to this group
-        if not tutor.assigned_groups.filter(id=group_id).exists():
-            messages.error(request, 'You do not have access to this group.')
-            return redirect('tutor_academic_groups')
-            
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
+    group = get_object_or_404(AcademicGroup, id=group_id)
+    
+    # Check if tutor has access to this group
+    if group_id not in tutor_group_ids(tutor.id):
+        messages.error(request, 'You do not have access to this group.')
+        return redirect('tutors:academic_groups')
+    
     # Get students in the group
     students = Student.objects.filter(academic_group=group, is_active=True).order_by('last_name', 'first_name')
     
@@ -121,10 +125,9 @@ def tutor_group_students_view(request, group_id):
     other_nations_count = total_students - uzbek_count
     capacity_percentage = round((total_students / group.max_students * 100)) if group.max_students > 0 else 0
     
-    # Apply pagination
-    paginator = Paginator(students, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Apply keyset pagination; the total is already known
+    paginator = KeysetPaginator(students, ['last_name', 'first_name', 'id'], 15, total=total_students)
+    page_obj = paginator.paginate(request.GET)
     
     context = {
         'tutor_name': request.session.get('tutor_name'),
@@ -142,6 +145,25 @@ def tutor_group_students_view(request, group_id):
     return render(request, 'tutors/group_students.html', context)
 
 
+def tutor_student_autocomplete_view(request):
+    """JSON search-as-you-type lookup of students in the tutor's groups"""
+    # Check if tutor is logged in
+    if 'tutor_id' not in request.session:
+        return JsonResponse({'results': [], 'error': 'Not logged in'}, status=401)
+    
+    # Get tutor
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
+        return JsonResponse({'results': [], 'error': 'Tutor not found'}, status=401)
+    
+    results = autocomplete_students(
+        tutor_group_ids(tutor.id),
+        request.GET.get('q', ''),
+        parse_limit(request.GET.get('limit')),
+    )
+    return JsonResponse({'results': results})
+
+
 def tutor_settings_view(request):
     """Handle tutor settings (profile and password)"""
     # Check if tutor is logged in
@@ -150,9 +172,8 @@ def tutor_settings_view(request):
         return redirect('login')
     
     # Get tutor
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
@@ -215,29 +236,24 @@ def tutor_add_student_view(request, group_id):
         return redirect('login')
     
     # Get tutor and group
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-        group = get_object_or_404(AcademicGroup, id=group_id)
-        
-        # Check if tutor has access to this group
-        if not tutor.assigned_groups.filter(id=group_id).exists():
-            messages.error(request, 'You do not have access to this group.')
-            return redirect('tutors:academic_groups')
-            
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
+    group = get_object_or_404(AcademicGroup, id=group_id)
+    
+    # Check if tutor has access to this group
+    if group_id not in tutor_group_ids(tutor.id):
+        messages.error(request, 'You do not have access to this group.')
+        return redirect('tutors:academic_groups')
+    
     if request.method == 'POST':
         form = StudentForm(request.POST, request.FILES, group=group)
         if form.is_valid():
             student = form.save(commit=False)
             student.academic_group = group
-            student.save()
-            
-            # Update group's current students count
-            group.current_students = group.students.filter(is_active=True).count()
-            group.save()
+            student.save()  # post_save signal bumps the group's student counter
             
             messages.success(request, f'Student {student.first_name} {student.last_name} added successfully!')
             return redirect('tutors:group_students', group_id=group.id)
@@ -266,19 +282,18 @@ def tutor_edit_student_view(request, student_id):
         return redirect('login')
     
     # Get tutor and student
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-        student = get_object_or_404(Student, id=student_id)
-        
-        # Check if tutor has access to this student's group
-        if not tutor.assigned_groups.filter(id=student.academic_group.id).exists():
-            messages.error(request, 'You do not have access to this student.')
-            return redirect('tutors:academic_groups')
-            
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
+    student = get_object_or_404(Student, id=student_id)
+    
+    # Check if tutor has access to this student's group
+    if student.academic_group_id not in tutor_group_ids(tutor.id):
+        messages.error(request, 'You do not have access to this student.')
+        return redirect('tutors:academic_groups')
+    
     if request.method == 'POST':
         form = StudentForm(request.POST, request.FILES, instance=student, group=student.academic_group)
         if form.is_valid():
@@ -311,19 +326,18 @@ def tutor_view_student_view(request, student_id):
         return redirect('login')
     
     # Get tutor and student
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-        student = get_object_or_404(Student, id=student_id)
-        
-        # Check if tutor has access to this student's group
-        if not tutor.assigned_groups.filter(id=student.academic_group.id).exists():
-            messages.error(request, 'You do not have access to this student.')
-            return redirect('tutors:academic_groups')
-            
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
+    student = get_object_or_404(Student, id=student_id)
+    
+    # Check if tutor has access to this student's group
+    if student.academic_group_id not in tutor_group_ids(tutor.id):
+        messages.error(request, 'You do not have access to this student.')
+        return redirect('tutors:academic_groups')
+    
     context = {
         'tutor_name': request.session.get('tutor_name'),
         'tutor_username': request.session.get('tutor_username'),
@@ -351,30 +365,25 @@ def tutor_delete_student_view(request, student_id):
         return redirect('login')
     
     # Get tutor and student
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-        student = get_object_or_404(Student, id=student_id)
-        
-        # Check if tutor has access to this student's group
-        if not tutor.assigned_groups.filter(id=student.academic_group.id).exists():
-            messages.error(request, 'You do not have access to this student.')
-            return redirect('tutors:academic_groups')
-            
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
+    student = get_object_or_404(Student, id=student_id)
+    
+    # Check if tutor has access to this student's group
+    if student.academic_group_id not in tutor_group_ids(tutor.id):
+        messages.error(request, 'You do not have access to this student.')
+        return redirect('tutors:academic_groups')
+    
     group = student.academic_group
     student_name = f"{student.first_name} {student.last_name}"
     
     if request.method == 'POST':
-        # Delete the student
+        # Delete the student (post_delete signal updates the group's counter)
         student.delete()
         
-        # Update group's current students count
-        group.current_students = group.students.filter(is_active=True).count()
-        group.save()
-        
         messages.success(request, f'Student {student_name} has been deleted successfully!')
         return redirect('tutors:group_students', group_id=group.id)
     
@@ -397,9 +406,8 @@ def tutor_reports_view(request):
         return redirect('login')
     
     # Get tutor
-    try:
-        tutor = Tutor.objects.get(id=request.session['tutor_id'])
-    except Tutor.DoesNotExist:
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
         messages.error(request, 'Tutor not found. Please log in again.')
         return redirect('login')
     
@@ -407,145 +415,35 @@ def tutor_reports_view(request):
     assigned_groups = tutor.assigned_groups.filter(is_active=True).order_by('group_name')
     
     # Get selected group (if any)
-    selected_group_id = request.GET.get('group')
-    selected_group = None
-    if selected_group_id and selected_group_id != 'all':
-        try:
-            selected_group = assigned_groups.get(id=int(selected_group_id))
-        except (ValueError, AcademicGroup.DoesNotExist):
-            selected_group = None
-    
-    # Get students queryset based on group selection
-    if selected_group:
-        students_queryset = Student.objects.filter(
-            academic_group=selected_group,
-            is_active=True
-        ).select_related(
-            'academic_group',
-            'academic_group__department',
-            'academic_group__school'
-        ).order_by('last_name', 'first_name')
-    else:
-        students_queryset = Student.objects.filter(
-            academic_group__in=assigned_groups,
-            is_active=True
-        ).select_related(
-            'academic_group',
-            'academic_group__department',
-            'academic_group__school'
-        ).order_by('academic_group__group_name', 'last_name', 'first_name')
-    
-    # Define all available fields organized by categories
-    FIELD_CATEGORIES = {
-        'Academic Information': {
-            'group_name': 'Group Name',
-            'department': 'Department',
-            'study_year': 'Study Year',
-        },
-        'Personal Information': {
-            'birthday': 'Date of Birth',
-            'gender': 'Gender',
-            'nation': 'Nationality',
-            'id_card': 'ID Card',
-            'home_address': 'Home Address',
-            'phone_number': 'Phone Number',
-            'email': 'Email',
-            'telegram_username': 'Telegram Username',
-            'marital_status': 'Marital Status',
-        },
-        'Family Status': {
-            'is_from_large_family': 'From Large Family',
-            'is_from_low_income_family': 'From Low Income Family',
-            'is_from_troubled_family': 'From Troubled Family',
-            'are_parents_deceased': 'Parents Deceased',
-            'are_parents_divorced': 'Parents Divorced',
-            'is_father_deceased': 'Father Deceased',
-            'is_mother_deceased': 'Mother Deceased',
-            'has_disability': 'Has Disability',
-        },
-        'Father Information': {
-            'father_first_name': "Father's First Name",
-            'father_last_name': "Father's Last Name",
-            'father_middle_name': "Father's Middle Name",
-            'father_phone_number': "Father's Phone Number",
-            'father_telegram_username': "Father's Telegram Username",
-            'is_father_retired': 'Father Retired',
-            'is_father_disabled': 'Father Disabled',
-        },
-        'Mother Information': {
-            'mother_first_name': "Mother's First Name",
-            'mother_last_name': "Mother's Last Name",
-            'mother_middle_name': "Mother's Middle Name",
-            'mother_phone_number': "Mother's Phone Number",
-            'mother_telegram_username': "Mother's Telegram Username",
-            'is_mother_retired': 'Mother Retired',
-            'is_mother_disabled': 'Mother Disabled',
-        },
-        'Additional Family Information': {
-            'siblings_count': 'Number of Siblings',
-            'children_count': 'Number of Children',
-        },
-        'Personal Interests': {
-            'hobbies': 'Hobbies and Interests',
-            'special_skills': 'Special Skills and Talents',
-            'languages_spoken': 'Languages Spoken',
-        },
-        'System/Agreement Fields': {
-            'agreed_to_code_of_conduct': 'Agreed to Code of Conduct',
-            'code_agreement_date': 'Date of Agreement',
-        }
-    }
+    selected_group = get_selected_group(assigned_groups, request.GET.get('group'))
+    
+    # Get students queryset based on group selection, narrowed by the row filters
+    student_filter = get_report_filter(
+        request.GET, get_report_queryset(assigned_groups, selected_group), assigned_groups
+    )
+    students_queryset = student_filter.qs
     
     # Get selected fields from request
-    selected_fields = []
-    for category, fields in FIELD_CATEGORIES.items():
-        for field_name, field_label in fields.items():
-            if request.GET.get(f'field_{field_name}'):
-                selected_fields.append(field_name)
+    selected_fields = get_selected_fields(request.GET)
     
-    # Format student data for display
+    # Get requested sort column and direction
+    sort, descending = get_report_sort(request.GET, selected_fields)
+    
+    # Format only the visible page of student data
+    page = None
     students_data = []
+    total_students = 0
+    headers = []
     if request.GET.get('apply_filter') and selected_fields:  # Only process if filter is applied
-        for student in students_queryset:
-            student_data = {
-                'id': student.id,
-                'full_name': student.get_full_name(),
-                'group_name': student.academic_group.group_name,
-            }
-            
-            # Add selected fields with proper formatting
-            for field in selected_fields:
-                if field == 'group_name':
-                    value = student.academic_group.group_name
-                elif field == 'department':
-                    value = student.academic_group.department.name if student.academic_group.department else 'Not provided'
-                elif field == 'study_year':
-                    value = student.academic_group.get_study_year_display() if student.academic_group.study_year else 'Not provided'
-                elif field == 'birthday':
-                    value = student.birthday.strftime('%d/%m/%Y') if student.birthday else 'Not provided'
-                elif field == 'code_agreement_date':
-                    value = student.code_agreement_date.strftime('%d/%m/%Y') if student.code_agreement_date else 'Not provided'
-                elif field.startswith('is_') or field.startswith('are_') or field.startswith('has_') or field == 'agreed_to_code_of_conduct':
-                    # Boolean fields
-                    field_value = getattr(student, field, False)
-                    value = 'Yes' if field_value else 'No'
-                elif field == 'gender':
-                    value = student.get_gender_display() if student.gender else 'Not provided'
-                elif field == 'nation':
-                    value = student.get_nation_display() if student.nation else 'Not provided'
-                elif field == 'marital_status':
-                    value = student.get_marital_status_display() if student.marital_status else 'Not provided'
-                else:
-                    # Text and number fields
-                    field_value = getattr(student, field, None)
-                    if field_value is None or field_value == '':
-                        value = 'Not provided'
-                    else:
-                        value = str(field_value)
-                
-                student_data[field] = value
-            
-            students_data.append(student_data)
+        page = get_report_page(
+            students_queryset,
+            selected_fields,
+            get_report_ordering(sort, descending, ranked=is_ranked(students_queryset)),
+            request.GET,
+        )
+        students_data = page.object_list
+        total_students = page.total
+        headers = get_report_headers(request.GET, selected_fields, sort, descending)
     
     context = {
         'tutor_name': request.session.get('tutor_name'),
@@ -555,9 +453,53 @@ def tutor_reports_view(request):
         'selected_group': selected_group,
         'field_categories': FIELD_CATEGORIES,
         'selected_fields': selected_fields,
+        'student_filter': student_filter,
         'students_data': students_data,
-        'total_students': len(students_data),
+        'total_students': total_students,
+        'page': page,
+        'headers': headers,
         'filter_applied': request.GET.get('apply_filter', False),
     }
     
-    return render(request, 'tutors/reports.html', context)
\ No newline at end of file
+    return render(request, 'tutors/reports.html', context)
+
+
+def tutor_reports_export_view(request, file_format):
+    """Export the current report selection as CSV or Excel"""
+    # Check if tutor is logged in
+    if 'tutor_id' not in request.session:
+        messages.error(request, 'Please log in to access this page.')
+        return redirect('login')
+    
+    # Get tutor
+    tutor = request.principal
+    if not isinstance(tutor, Tutor):
+        messages.error(request, 'Tutor not found. Please log in again.')
+        return redirect('login')
+    
+    if file_format not in EXPORT_FORMATS:
+        messages.error(request, 'Unsupported export format.')
+        return redirect('tutors:reports')
+    
+    # Same group and field selection as the reports page
+    assigned_groups = tutor.assigned_groups.filter(is_active=True).order_by('group_name')
+    selected_group = get_selected_group(assigned_groups, request.GET.get('group'))
+    selected_fields = get_selected_fields(request.GET)
+    
+    if not selected_fields:
+        messages.error(request, 'Please select at least one field to export.')
+        return redirect('tutors:reports')
+    
+    # Export in the order the report page is sorted by
+    sort, descending = get_report_sort(request.GET, selected_fields)
+    student_filter = get_report_filter(
+        request.GET, get_report_queryset(assigned_groups, selected_group), assigned_groups
+    )
+    students_queryset = sort_report_queryset(
+        student_filter.qs, get_report_ordering(sort, descending, ranked=is_ranked(student_filter.qs))
+    )
+    filename = f"student_report_{timezone.now().strftime('%Y%m%d_%H%M')}"
+    
+    if file_format == 'csv':
+        return csv_response(students_queryset, selected_fields, filename)
+    return xlsx_response(students_queryset, selected_fields, filename)